@@ -268,7 +268,8 @@ async def connect_camera(request: Request, cam_id: str, user: UserSchema = Depen
     # Start Streamer
     streamer = VideoStreamer(res['stream_uri'], transport_mode=config.transport_mode)
     streamer.set_camera_info(id=cam_id, name=cam_data.get('name'), location=cam_data.get('location'))
-    success = streamer.start()
+    # Opening RTSP and reading warm-up frames blocks for up to several seconds
+    success = await asyncio.to_thread(streamer.start)
     
     if not success:
         conn.disconnect()
@@ -357,7 +358,7 @@ async def video_feed(request: Request, cam_id: str):
     
     streamer = active_cameras[cam_id]['streamer']
     if not streamer.is_streaming:
-         streamer.start()
+         await asyncio.to_thread(streamer.start)
 
     async def gen():
         try:
@@ -384,13 +385,14 @@ async def ptz_action(request: Request, cam_id: str, action: str, req: PTZRequest
     
     ptz = active_cameras[cam_id]['ptz']
     
-    if action == "up": return ptz.move(tilt=req.speed)
-    if action == "down": return ptz.move(tilt=-req.speed)
-    if action == "left": return ptz.move(pan=-req.speed)
-    if action == "right": return ptz.move(pan=req.speed)
-    if action == "zoom_in": return ptz.move(zoom=req.speed)
-    if action == "zoom_out": return ptz.move(zoom=-req.speed)
-    if action == "stop": return ptz.stop()
+    # ONVIF SOAP calls are blocking; run them in a worker thread
+    if action == "up": return await asyncio.to_thread(ptz.move, tilt=req.speed)
+    if action == "down": return await asyncio.to_thread(ptz.move, tilt=-req.speed)
+    if action == "left": return await asyncio.to_thread(ptz.move, pan=-req.speed)
+    if action == "right": return await asyncio.to_thread(ptz.move, pan=req.speed)
+    if action == "zoom_in": return await asyncio.to_thread(ptz.move, zoom=req.speed)
+    if action == "zoom_out": return await asyncio.to_thread(ptz.move, zoom=-req.speed)
+    if action == "stop": return await asyncio.to_thread(ptz.stop)
     
     raise HTTPException(400, "Invalid action")
 
@@ -407,7 +409,8 @@ async def capture_image(request: Request, cam_id: str, user: UserSchema = Depend
 
     if cam_id not in active_cameras:
          raise HTTPException(404, "Camera not connected")
-    return active_cameras[cam_id]['streamer'].capture_image()
+    # Retries sleep and the JPEG encode/write block; keep them off the event loop
+    return await asyncio.to_thread(active_cameras[cam_id]['streamer'].capture_image)
 
 # Stream Info
 @router.get("/{cam_id}/stream-info")
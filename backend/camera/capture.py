@@ -9,7 +9,6 @@ import contextlib
 from typing import Optional, AsyncGenerator, Dict, Any
 from datetime import datetime
 from pathlib import Path
-from PIL import Image
 import numpy as np
 from backend.config import DATA_DIR, PROJECT_ROOT
 
@@ -18,15 +17,32 @@ from backend.config import DATA_DIR, PROJECT_ROOT
 os.environ["OPENCV_LOG_LEVEL"] = "SILENT"
 os.environ["OPENCV_FFMPEG_LOGLEVEL"] = "-8"  # AV_LOG_QUIET
 
+RTSP_UDP_BUFFER = 8 * 1024 * 1024  # SO_RCVBUF for the UDP transport
+
+
+def rtsp_capture_options(transport: str = "tcp") -> str:
+    """
+    FFmpeg options for OpenCV RTSP capture (OPENCV_FFMPEG_CAPTURE_OPTIONS).
+    Video only, tolerant of corrupt HEVC packets, no demuxer buffering, and
+    half-second stream probing instead of a full second before first frame.
+    """
+    transport = "udp" if transport.lower() == "udp" else "tcp"
+    # RTP over UDP drops packets when an I-frame burst overflows the socket
+    # receive buffer (on Linux, capped by net.core.rmem_max)
+    udp_opts = f"buffer_size;{RTSP_UDP_BUFFER}|" if transport == "udp" else ""
+    return (
+        f"rtsp_transport;{transport}|"
+        f"{udp_opts}"
+        "allowed_media_types;video|"
+        "fflags;discardcorrupt+nobuffer|"
+        "err_detect;ignore_err|"
+        "analyzeduration;500000|"
+        "probesize;500000"
+    )
+
+
 # Force TCP and add options for better HEVC stream handling
-os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = (
-    "rtsp_transport;tcp|"
-    "allowed_media_types;video|"
-    "fflags;discardcorrupt|"
-    "err_detect;ignore_err|"
-    "analyzeduration;1000000|"
-    "probesize;1000000"
-)
+os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = rtsp_capture_options("tcp")
 
 # Additional FFmpeg log suppression (affects libavcodec)
 os.environ["AV_LOG_FORCE_NOCOLOR"] = "1"
@@ -79,7 +95,8 @@ class VideoStreamer:
         self.is_streaming = False
         self.last_frame: Optional[np.ndarray] = None
         self.frame_count = 0
-        self.frame_queue: queue.Queue = queue.Queue(maxsize=2)
+        # Latest-wins handoff: the capture thread replaces any unconsumed frame
+        self.frame_queue: queue.Queue = queue.Queue(maxsize=1)
         self.capture_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
         self._reconnect_attempts = 0
@@ -152,14 +169,7 @@ class VideoStreamer:
         time.sleep(self._reconnect_delay)
         try:
             # Set transport mode env before opening
-            transport = "tcp" if self.transport_mode.lower() == "tcp" else "udp"
-            os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = (
-                f"rtsp_transport;{transport}|"
-                "fflags;discardcorrupt|"
-                "err_detect;ignore_err|"
-                "analyzeduration;1000000|"
-                "probesize;1000000"
-            )
+            os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = rtsp_capture_options(self.transport_mode)
             with suppress_ffmpeg_stderr():
                 self.cap = cv2.VideoCapture(self.rtsp_uri, cv2.CAP_FFMPEG)
             if self.cap.isOpened():
@@ -179,14 +189,7 @@ class VideoStreamer:
         self._stop_event.clear()
         try:
             # Set transport mode env
-            transport = "tcp" if self.transport_mode.lower() == "tcp" else "udp"
-            os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = (
-                f"rtsp_transport;{transport}|"
-                "fflags;discardcorrupt|"
-                "err_detect;ignore_err|"
-                "analyzeduration;1000000|"
-                "probesize;1000000"
-            )
+            os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = rtsp_capture_options(self.transport_mode)
 
             with suppress_ffmpeg_stderr():
                 self.cap = cv2.VideoCapture(self.rtsp_uri, cv2.CAP_FFMPEG)
@@ -240,11 +243,20 @@ class VideoStreamer:
     
     async def generate_frames(self) -> AsyncGenerator[bytes, None]:
         empty_count = 0
+        last_sent = -1
         while self.is_streaming:
-            jpeg = self.get_frame_jpeg()
+            # Only encode/send when the capture thread has produced a new frame;
+            # re-sending an unchanged frame just burns CPU and bandwidth.
+            seq = self.frame_count
+            if seq == last_sent:
+                await asyncio.sleep(0.04)
+                continue
+            # JPEG encoding a full-res frame takes milliseconds; keep it off the event loop
+            jpeg = await asyncio.to_thread(self.get_frame_jpeg)
             if jpeg:
                 yield b'--frame\r\nContent-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n'
                 empty_count = 0
+                last_sent = seq
             else:
                 empty_count += 1
                 if empty_count >= 50: break
@@ -282,8 +294,11 @@ class VideoStreamer:
                 
                 filename = self.capture_dir / f"{safe_name}_{safe_loc}_{date_str}_{time_str}.jpg"
                 
-                frame_rgb = cv2.cvtColor(self.last_frame, cv2.COLOR_BGR2RGB)
-                Image.fromarray(frame_rgb).save(filename, quality=95)
+                # OpenCV encodes the BGR frame as-is: no RGB copy, no PIL round trip
+                ok, jpeg = cv2.imencode('.jpg', self.last_frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
+                if not ok:
+                    raise ValueError("JPEG encoding failed")
+                filename.write_bytes(jpeg)
                 
                 if attempts > 0:
                     logger_logic.log_event(self.cam_id, "Capture Success", f"Captured after {attempts} retries.")
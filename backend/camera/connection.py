@@ -1,4 +1,6 @@
 import datetime
+import socket
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any
 from onvif import ONVIFCamera
 from dataclasses import dataclass
@@ -6,6 +8,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# TCP connect timeout (seconds) when probing candidate ONVIF ports
+PORT_PROBE_TIMEOUT = 2.0
+
 @dataclass
 class CameraConnectionConfig:
     ip: str
@@ -19,6 +24,10 @@ class CameraConnectionConfig:
     stream_type: str = "main"
 
 class CameraConnection:
+    # (ip, onvif_port, user, password, stream_type) -> (profile_token, raw stream URI).
+    # Lets a reconnect skip the GetStreamUri round trip while the profile still exists.
+    _stream_uri_cache: Dict[tuple, tuple] = {}
+
     def __init__(self, config: CameraConnectionConfig):
         self.config = config
         self.camera: Optional[ONVIFCamera] = None
@@ -30,6 +39,19 @@ class CameraConnection:
         self.resolution = {"width": 0, "height": 0}
         self.model = "Unknown"
 
+    def _open_device(self, port: int, mode: str) -> ONVIFCamera:
+        logger.info(f"Connecting to {self.config.ip}:{port} ({mode})")
+        camera = ONVIFCamera(self.config.ip, port, self.config.user, self.config.password)
+        camera.create_devicemgmt_service()
+        return camera
+
+    def _port_open(self, port: int) -> bool:
+        try:
+            with socket.create_connection((self.config.ip, port), timeout=PORT_PROBE_TIMEOUT):
+                return True
+        except OSError:
+            return False
+
     def connect(self) -> Dict[str, Any]:
         # 1. Determine Port Sequence
         if self.config.onvif_port:
@@ -42,23 +64,32 @@ class CameraConnection:
         last_error = "Unknown error"
         
         # 2. Device Management Connection
+        # Auto-detect: a cheap TCP connect to every candidate port at once (each miss
+        # costs a full connect timeout), so the ONVIF handshake only runs on open ports.
+        # The probes are bounded by PORT_PROBE_TIMEOUT and all finish before we go on.
+        if len(ports_to_try) > 1:
+            with ThreadPoolExecutor(max_workers=len(ports_to_try), thread_name_prefix="onvif-probe") as pool:
+                reachable = list(pool.map(self._port_open, ports_to_try))
+            ports_to_try = [port for port, ok in zip(ports_to_try, reachable) if ok]
+            last_error = "No candidate ONVIF port is reachable"
+
+        self.camera = None
         for port in ports_to_try:
             try:
-                logger.info(f"Connecting to {self.config.ip}:{port} ({mode})")
-                self.camera = ONVIFCamera(self.config.ip, port, self.config.user, self.config.password)
-                self.camera.create_devicemgmt_service()
-                
-                # Fetch Device Info
-                try:
-                    info = self.camera.devicemgmt.GetDeviceInformation()
-                    self.model = f"{info.Manufacturer} {info.Model}"
-                except: pass
-                
-                self.config.onvif_port = port
-                break
+                self.camera = self._open_device(port, mode)
             except Exception as e:
                 last_error = str(e)
                 self.camera = None
+                continue
+            
+            # Fetch Device Info
+            try:
+                info = self.camera.devicemgmt.GetDeviceInformation()
+                self.model = f"{info.Manufacturer} {info.Model}"
+            except: pass
+            
+            self.config.onvif_port = port
+            break
         
         if not self.camera:
             self.connected = False
@@ -105,18 +136,28 @@ class CameraConnection:
             if not selected_profile:
                 selected_profile = profiles[0]
 
-            # 5. Get Stream URI
-            obj = self.media_service.create_type('GetStreamUri')
-            obj.StreamSetup = {
-                'Stream': 'RTP-Unicast', 
-                'Transport': {'Protocol': 'RTSP'}
-            }
-            obj.ProfileToken = selected_profile.token
-            
-            try:
-                uri = self.media_service.GetStreamUri(obj).Uri
-            except Exception as e:
-                return {"success": False, "error": f"Failed to get Stream URI: {str(e)}"}
+            # 5. Get Stream URI (reuse the cached one if the profile is unchanged)
+            cache_key = (
+                self.config.ip, self.config.onvif_port, self.config.user,
+                self.config.password, self.config.stream_type,
+            )
+            cached = self._stream_uri_cache.get(cache_key)
+            if cached and cached[0] == selected_profile.token:
+                uri = cached[1]
+            else:
+                obj = self.media_service.create_type('GetStreamUri')
+                obj.StreamSetup = {
+                    'Stream': 'RTP-Unicast', 
+                    'Transport': {'Protocol': 'RTSP'}
+                }
+                obj.ProfileToken = selected_profile.token
+                
+                try:
+                    uri = self.media_service.GetStreamUri(obj).Uri
+                except Exception as e:
+                    self._stream_uri_cache.pop(cache_key, None)
+                    return {"success": False, "error": f"Failed to get Stream URI: {str(e)}"}
+                self._stream_uri_cache[cache_key] = (selected_profile.token, uri)
             
             # Inject Credentials into URI
             if self.config.user and "@" not in uri and uri.startswith("rtsp://"):
@@ -1,4 +1,5 @@
 import time
+import threading
 from typing import Dict, Any, Optional
 import logging
 
@@ -12,6 +13,40 @@ class PTZController:
         self._ptz_node = None
         self._velocity_space = None
         self._position_space = None
+        self._move_method = None
+        self._stop_timer: Optional[threading.Timer] = None
+        self._stop_gen = 0  # bumped whenever the pending stop is replaced or dropped
+        self._stop_lock = threading.Lock()
+
+    def _schedule_stop(self, duration: float):
+        """Stop the continuous move after `duration` without blocking the caller.
+        A newer move replaces the pending stop so held buttons don't stutter."""
+        with self._stop_lock:
+            if self._stop_timer:
+                self._stop_timer.cancel()
+            self._stop_gen += 1
+            timer = threading.Timer(duration, self._timed_stop, args=(self._stop_gen,))
+            timer.daemon = True
+            self._stop_timer = timer
+        timer.start()
+
+    def _cancel_pending_stop(self):
+        """Drop the scheduled stop. A timer that is already firing sees it was
+        superseded and returns without sending Stop."""
+        with self._stop_lock:
+            if self._stop_timer:
+                self._stop_timer.cancel()
+            self._stop_timer = None
+            self._stop_gen += 1
+
+    def _timed_stop(self, gen: int):
+        """Timer callback: stop the move unless a newer move or stop replaced this timer."""
+        with self._stop_lock:
+            if gen != self._stop_gen:
+                return
+            self._stop_timer = None
+        # The SOAP call runs outside the lock so a new move() never waits on it
+        self._send_stop()
 
     def _ensure_ptz(self) -> bool:
         return self.conn.connected and self.conn.ptz_service is not None
@@ -63,21 +98,6 @@ class PTZController:
         success = False
         last_error = None
 
-        # Helper to execute move with specific vectors
-        def execute_move(p, t, z):
-            methods = [
-                self._try_continuous_move_with_space,
-                self._try_continuous_move_simple,
-                self._try_relative_move,
-            ]
-            for method in methods:
-                result = method(p, t, z, duration)
-                if result.get("success"):
-                    return True, None
-                last_error = result.get("error")
-                logger.debug(f"{method.__name__} failed: {last_error}")
-            return False, last_error
-
         # If we have both Pan/Tilt AND Zoom, we might need to try sending them together, 
         # but if that fails, try separately.
         # Ideally, we construct the request based on what IS changing.
@@ -92,19 +112,30 @@ class PTZController:
         if not is_moving_pt and not is_moving_zoom:
              return {"success": True, "message": "No movement requested"}
 
+        # This move supersedes the previous one's timed stop
+        self._cancel_pending_stop()
+
         methods = [
             self._try_continuous_move_smart, # New smart method
             self._try_continuous_move_simple,
             self._try_relative_move,
         ]
+        # Lead with the variant this camera accepted last time, so cameras that
+        # reject the first variants don't pay failed SOAP round trips per press
+        if self._move_method in methods:
+            methods.remove(self._move_method)
+            methods.insert(0, self._move_method)
         
         for method in methods:
             result = method(pan, tilt, zoom, duration)
             if result.get("success"):
+                self._move_method = method
                 return result
             # Log the specific error for debugging
             logger.info(f"PTZ method {method.__name__} failed: {result.get('error')}")
         
+        # The previous move's stop was cancelled above; don't leave the camera moving
+        self._send_stop()
         return {"success": False, "error": "All PTZ methods failed for this camera"}
 
     def _try_continuous_move_smart(self, pan: float, tilt: float, zoom: float, duration: float) -> Dict[str, Any]:
@@ -130,8 +161,7 @@ class PTZController:
                 'ProfileToken': self.conn.profile_token,
                 'Velocity': velocity
             })
-            time.sleep(duration)
-            self.stop()
+            self._schedule_stop(duration)
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -157,8 +187,7 @@ class PTZController:
                 'ProfileToken': self.conn.profile_token,
                 'Velocity': velocity
             })
-            time.sleep(duration)
-            self.stop()
+            self._schedule_stop(duration)
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -178,8 +207,7 @@ class PTZController:
                     'Zoom': {'x': zoom * 0.5}
                 }
             })
-            time.sleep(duration)
-            self.stop()
+            self._schedule_stop(duration)
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -212,6 +240,10 @@ class PTZController:
             return {"success": False, "error": str(e)}
 
     def stop(self) -> Dict[str, Any]:
+        self._cancel_pending_stop()
+        return self._send_stop()
+
+    def _send_stop(self) -> Dict[str, Any]:
         if not self._ensure_ptz():
              return {"success": False, "error": "PTZ not available"}
         try:
@@ -2,6 +2,7 @@ import csv
 import shutil
 import uuid
 import re
+from functools import lru_cache
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Optional, Any
@@ -12,6 +13,9 @@ from backend.config import DATA_DIR
 
 logger = logging.getLogger(__name__)
 
+# Characters stripped from plates before comparison (compiled once)
+_PLATE_STRIP_RE = re.compile(r'[^a-zA-Z0-9]')
+
 class RegisteredCarLogic:
     HEADERS = [
         "car_id", "car_plate", "car_brand", "car_model", 
@@ -94,8 +98,9 @@ class RegisteredCarLogic:
         return self._read_csv()
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def normalize_plate(plate: str) -> str:
-        return re.sub(r'[^a-zA-Z0-9]', '', plate).upper()
+        return _PLATE_STRIP_RE.sub('', plate).upper()
 
     def get_car_by_plate(self, plate: str) -> Optional[Dict[str, str]]:
         norm_plate = self.normalize_plate(plate)
@@ -146,11 +146,8 @@ async def update_data_expiry_settings(
     return {"success": True, "message": "Data expiry settings updated"}
 
 
-@router.post("/data-expiry/cleanup")
-async def manual_cleanup_expired_data():
-    """Manually trigger cleanup of expired data."""
-    expiry_config = load_expiry_config()
-    
+def _cleanup_expired_data(expiry_config: dict) -> dict:
+    """Delete data past its expiry and return the per-kind counts (blocking)."""
     result = {
         "registered_cars_deleted": 0,
         "history_deleted": 0,
@@ -158,57 +155,67 @@ async def manual_cleanup_expired_data():
         "car_history_folders_deleted": 0
     }
     
-    try:
-        today = datetime.now().date()
-        
-        # Clean up registered_cars CSV files
-        reg_days = expiry_config.get("registered_cars_days", 30)
-        for csv_file in settings.data_dir.glob("registered_cars_*.csv"):
-            try:
-                date_str = csv_file.stem.split("_")[-1]  # registered_cars_DD-MM-YYYY
-                file_date = datetime.strptime(date_str, "%d-%m-%Y").date()
-                if (today - file_date).days >= reg_days:
-                    csv_file.unlink()
-                    result["registered_cars_deleted"] += 1
-            except Exception:
-                pass
-        
-        # Clean up history CSV files
-        history_days = expiry_config.get("history_days", 30)
-        for csv_file in settings.data_dir.glob("history_*.csv"):
-            try:
-                date_str = csv_file.stem.split("_")[-1]
-                file_date = datetime.strptime(date_str, "%d-%m-%Y").date()
-                if (today - file_date).days >= history_days:
-                    csv_file.unlink()
-                    result["history_deleted"] += 1
-            except Exception:
-                pass
-        
-        # Clean up report JSON files
-        reports_days = expiry_config.get("reports_days", 30)
-        for report_file in settings.report_dir.glob("report_*.json"):
+    today = datetime.now().date()
+    
+    # Clean up registered_cars CSV files
+    reg_days = expiry_config.get("registered_cars_days", 30)
+    for csv_file in settings.data_dir.glob("registered_cars_*.csv"):
+        try:
+            date_str = csv_file.stem.split("_")[-1]  # registered_cars_DD-MM-YYYY
+            file_date = datetime.strptime(date_str, "%d-%m-%Y").date()
+            if (today - file_date).days >= reg_days:
+                csv_file.unlink()
+                result["registered_cars_deleted"] += 1
+        except Exception:
+            pass
+    
+    # Clean up history CSV files
+    history_days = expiry_config.get("history_days", 30)
+    for csv_file in settings.data_dir.glob("history_*.csv"):
+        try:
+            date_str = csv_file.stem.split("_")[-1]
+            file_date = datetime.strptime(date_str, "%d-%m-%Y").date()
+            if (today - file_date).days >= history_days:
+                csv_file.unlink()
+                result["history_deleted"] += 1
+        except Exception:
+            pass
+    
+    # Clean up report JSON files
+    reports_days = expiry_config.get("reports_days", 30)
+    for report_file in settings.report_dir.glob("report_*.json"):
+        try:
+            date_str = report_file.stem.split("_")[-1]
+            file_date = datetime.strptime(date_str, "%d-%m-%Y").date()
+            if (today - file_date).days >= reports_days:
+                report_file.unlink()
+                result["reports_deleted"] += 1
+        except Exception:
+            pass
+    
+    # Clean up car_history folders
+    car_history_days = expiry_config.get("car_history_days", 30)
+    for date_folder in settings.car_history_dir.iterdir():
+        if date_folder.is_dir():
             try:
-                date_str = report_file.stem.split("_")[-1]
-                file_date = datetime.strptime(date_str, "%d-%m-%Y").date()
-                if (today - file_date).days >= reports_days:
-                    report_file.unlink()
-                    result["reports_deleted"] += 1
+                folder_date = datetime.strptime(date_folder.name, "%d-%m-%Y").date()
+                if (today - folder_date).days >= car_history_days:
+                    shutil.rmtree(date_folder)
+                    result["car_history_folders_deleted"] += 1
             except Exception:
                 pass
-        
-        # Clean up car_history folders
-        car_history_days = expiry_config.get("car_history_days", 30)
-        for date_folder in settings.car_history_dir.iterdir():
-            if date_folder.is_dir():
-                try:
-                    folder_date = datetime.strptime(date_folder.name, "%d-%m-%Y").date()
-                    if (today - folder_date).days >= car_history_days:
-                        shutil.rmtree(date_folder)
-                        result["car_history_folders_deleted"] += 1
-                except Exception:
-                    pass
-        
+    
+    return result
+
+
+@router.post("/data-expiry/cleanup")
+async def manual_cleanup_expired_data():
+    """Manually trigger cleanup of expired data."""
+    expiry_config = load_expiry_config()
+    
+    try:
+        # rmtree over whole days of evidence images - keep it off the event loop
+        result = await asyncio.to_thread(_cleanup_expired_data, expiry_config)
         return {"success": True, **result}
         
     except Exception as e:
@@ -7,11 +7,13 @@ Provides separate loggers for:
 - Frontend: Dev server output (development mode only)
 """
 
-import logging
 import sys
+import queue
+import atexit
+import logging
 from pathlib import Path
 from datetime import datetime
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 
 # Log directory
 LOG_DIR = Path(__file__).parent.parent / "database" / "logs"
@@ -67,8 +69,18 @@ def setup_backend_logging():
         return backend_logger
     
     backend_logger.setLevel(logging.DEBUG)  # Capture all levels
-    backend_logger.addHandler(get_file_handler("backend", detailed=True))
-    backend_logger.addHandler(get_console_handler(detailed=True))
+    # Records are queued and written by a listener thread, so file/console I/O
+    # never runs on the request path (the event loop only enqueues)
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(
+        log_queue,
+        get_file_handler("backend", detailed=True),
+        get_console_handler(detailed=True),
+        respect_handler_level=True,
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    backend_logger.addHandler(QueueHandler(log_queue))
     backend_logger.propagate = False
     
     # Also configure uvicorn loggers to use our handler
@@ -1 +1,30 @@
+from typing import Optional
+
+import httpx
+
 MODEL_API_URL = "https://thpttl12t1--truck-api-fastapi-app.modal.run"
+
+# Camera function names routed to plate OCR (match after .lower().strip())
+PLATE_FUNCTIONS = ("plate", "alpr", "plate_detect")
+
+# Keep-alive client shared by the AI API detectors (created on first use)
+_model_client: Optional[httpx.AsyncClient] = None
+
+
+def get_model_client() -> httpx.AsyncClient:
+    """Get the shared AI API client so detector calls reuse pooled connections."""
+    global _model_client
+    if _model_client is None or _model_client.is_closed:
+        _model_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+    return _model_client
+
+
+async def close_model_client():
+    """Close the shared AI API client (app shutdown)."""
+    global _model_client
+    if _model_client is not None:
+        await _model_client.aclose()
+        _model_client = None
@@ -2,6 +2,7 @@
 import asyncio
 import logging
 from typing import Dict, List, Any, Optional, Union
+import cv2
 import numpy as np
 from pathlib import Path
 
@@ -10,6 +11,7 @@ from backend.model_process.functions.plate import PlateDetector
 from backend.model_process.functions.wheel import WheelDetector
 from backend.model_process.functions.color import ColorDetector
 from backend.model_process.functions.volume import VolumeDetector
+from backend.model_process.config import PLATE_FUNCTIONS
 
 logger = logging.getLogger(__name__)
 
@@ -53,10 +55,23 @@ class ModelOrchestrator:
                 logger.error(f"Error running {name} detection: {e}", exc_info=True)
                 return name, {"detected": False, "error": str(e)}
 
+        # The HTTP detectors all upload the same JPEG: encode it once, off the loop
+        encode_task = None
+
+        def encode_frame() -> Optional[bytes]:
+            success, encoded_image = cv2.imencode('.jpg', frame)
+            return encoded_image.tobytes() if success else None
+
+        async def get_encoded() -> Optional[bytes]:
+            nonlocal encode_task
+            if encode_task is None:
+                encode_task = asyncio.ensure_future(asyncio.to_thread(encode_frame))
+            return await encode_task
+
         # Helper for ASYNC detectors (Plate, Wheel, Color use httpx)
         async def run_async_detect(name: str, detector: Any) -> tuple[str, Dict]:
             try:
-                result = await detector.detect(frame)
+                result = await detector.detect(frame, encoded=await get_encoded())
                 return name, result
             except Exception as e:
                 logger.error(f"Error running {name} detection: {e}", exc_info=True)
@@ -70,7 +85,7 @@ class ModelOrchestrator:
                 # Truck detector is sync (YOLO)
                 tasks.append(run_sync_detect("truck", self.truck_detector))
                 
-            elif func_lower in ["plate", "alpr", "plate_detect"]:
+            elif func_lower in PLATE_FUNCTIONS:
                 # Plate detector is ASYNC
                 tasks.append(run_async_detect("plate", self.plate_detector))
                 
@@ -94,16 +109,47 @@ class ModelOrchestrator:
         results = {name: res for name, res in results_list}
         return results
 
+    async def process_images(self, frames: List[np.ndarray], functions_list: List[List[str]]) -> List[Dict[str, Any]]:
+        """
+        Run detection on several frames in one pass.
+        
+        Every (frame, function) detector call is scheduled together, so a
+        multi-camera checkout costs roughly its slowest detector rather than
+        the sum over images.
+        
+        Args:
+            frames: Input images (BGR numpy arrays)
+            functions_list: Function names to run for each frame (same order)
+            
+        Returns:
+            One result dictionary per frame, in input order. A frame whose
+            processing failed yields an empty dictionary.
+        """
+        results_list = await asyncio.gather(
+            *(self.process_image(frame, funcs) for frame, funcs in zip(frames, functions_list)),
+            return_exceptions=True
+        )
+        
+        results = []
+        for res in results_list:
+            if isinstance(res, Exception):
+                logger.error(f"Error processing frame: {res}", exc_info=res)
+                res = {}
+            results.append(res)
+        return results
+
     async def process_volume(
         self, 
         side_image_path: Path, 
         top_fg_image_path: Path, 
         top_bg_image_path: Path,
         side_calib_path: Path,
-        top_calib_path: Path
+        top_calib_path: Path,
+        preloaded: Optional[Dict[str, bytes]] = None
     ) -> Dict[str, Any]:
         """
         Special orchestration for volume detection which requires specific file inputs.
+        Inputs already read by the caller can be passed as preloaded (str(path) -> bytes).
         """
         try:
             # VolumeDetector is already async
@@ -112,7 +158,8 @@ class ModelOrchestrator:
                 top_fg_image_path, 
                 top_bg_image_path,
                 side_calib_path, 
-                top_calib_path
+                top_calib_path,
+                preloaded=preloaded
             )
         except Exception as e:
             logger.error(f"Error in process_volume: {e}", exc_info=True)
@@ -1,32 +1,34 @@
 import cv2
 import numpy as np
 import logging
-import httpx
-from typing import Dict, Any
-from backend.model_process.config import MODEL_API_URL
+from typing import Dict, Any, Optional
+from backend.model_process.config import MODEL_API_URL, get_model_client
 
 logger = logging.getLogger(__name__)
 
 class ColorDetector:
     ENDPOINT = "/detect_colors"
     
-    async def detect(self, frame: np.ndarray) -> Dict[str, Any]:
+    async def detect(self, frame: np.ndarray, encoded: Optional[bytes] = None) -> Dict[str, Any]:
         """
         Detect vehicle color via async API.
         """
         if frame is None:
             return {"detected": False, "error": "Empty frame"}
         
-        success, encoded_image = cv2.imencode('.jpg', frame)
-        if not success: return {"detected": False, "error": "Encoding failed"}
+        # Encode image (the orchestrator passes one shared encoding per frame)
+        if encoded is None:
+            success, encoded_image = cv2.imencode('.jpg', frame)
+            if not success:
+                return {"detected": False, "error": "Encoding failed"}
+            encoded = encoded_image.tobytes()
         
-        files = {"file": ("image.jpg", encoded_image.tobytes(), "image/jpeg")}
+        files = {"file": ("image.jpg", encoded, "image/jpeg")}
         headers = {"accept": "application/json"}
         
         try:
             url = f"{MODEL_API_URL}{self.ENDPOINT}"
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                resp = await client.post(url, files=files, headers=headers)
+            resp = await get_model_client().post(url, files=files, headers=headers)
             
             if resp.status_code != 200:
                 logger.error(f"Color API error {resp.status_code}: {resp.text}")
@@ -1,34 +1,68 @@
 import cv2
 import numpy as np
 import logging
-import httpx
-from typing import Dict, Any
-from backend.model_process.config import MODEL_API_URL
+from typing import Dict, Any, Optional
+from backend.model_process.config import MODEL_API_URL, get_model_client
 
 logger = logging.getLogger(__name__)
 
+# Haar plate cascade used as a cheap local pre-filter before the remote OCR call.
+# Loaded once on first use; None when OpenCV ships without cascade data.
+_plate_cascade = None
+_cascade_loaded = False
+
+
+def _get_plate_cascade():
+    global _plate_cascade, _cascade_loaded
+    if not _cascade_loaded:
+        _cascade_loaded = True
+        try:
+            cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_russian_plate_number.xml")
+            _plate_cascade = None if cascade.empty() else cascade
+        except Exception as e:
+            logger.warning(f"Plate cascade unavailable: {e}")
+        if _plate_cascade is None:
+            logger.warning("Plate cascade not found, plate pre-filter disabled")
+    return _plate_cascade
+
+
+def has_plate_candidate(frame: np.ndarray) -> bool:
+    """
+    Cheap check for a plate-like region in the frame.
+    
+    Returns True when a candidate is found or the cascade is unavailable,
+    so a missing cascade never suppresses OCR.
+    """
+    cascade = _get_plate_cascade()
+    if cascade is None:
+        return True
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return len(cascade.detectMultiScale(gray, scaleFactor=1.2, minSize=(60, 20))) > 0
+
+
 class PlateDetector:
     ENDPOINT = "/alpr"
     
-    async def detect(self, frame: np.ndarray) -> Dict[str, Any]:
+    async def detect(self, frame: np.ndarray, encoded: Optional[bytes] = None) -> Dict[str, Any]:
         """
         Detect license plate via async API.
         """
         if frame is None:
             return {"detected": False, "error": "Empty frame"}
         
-        # Encode image
-        success, encoded_image = cv2.imencode('.jpg', frame)
-        if not success:
-            return {"detected": False, "error": "Encoding failed"}
+        # Encode image (the orchestrator passes one shared encoding per frame)
+        if encoded is None:
+            success, encoded_image = cv2.imencode('.jpg', frame)
+            if not success:
+                return {"detected": False, "error": "Encoding failed"}
+            encoded = encoded_image.tobytes()
         
-        files = {"file": ("image.jpg", encoded_image.tobytes(), "image/jpeg")}
+        files = {"file": ("image.jpg", encoded, "image/jpeg")}
         headers = {"accept": "application/json"}
         
         try:
             url = f"{MODEL_API_URL}{self.ENDPOINT}"
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                resp = await client.post(url, files=files, headers=headers)
+            resp = await get_model_client().post(url, files=files, headers=headers)
             
             if resp.status_code != 200:
                 logger.error(f"Plate API Error {resp.status_code}: {resp.text}")
@@ -8,6 +8,7 @@ Uses ONNX Runtime for inference (~50MB vs ~2GB for PyTorch).
 from typing import Dict, Any, Optional, List
 import numpy as np
 import logging
+import threading
 from pathlib import Path
 import cv2
 
@@ -27,6 +28,16 @@ TARGET_CLASSES = list(COCO_CLASSES.keys())
 class TruckDetector:
     """YOLO-based vehicle detector using ONNX Runtime"""
     
+    # ONNX session shared by every detector instance (orchestrator, background
+    # manager, ...) so the weights are loaded once per process. Confidence
+    # stays per-instance since it is only applied in _postprocess.
+    _shared_session = None
+    _load_lock = threading.Lock()
+    # Overlapping checkouts call detect() from several worker threads at once.
+    # Each ORT run already spreads over every core, so concurrent runs only
+    # fight over the intra-op pool; queue them instead.
+    _run_lock = threading.Lock()
+    
     def __init__(self, confidence: float = 0.25):
         self.confidence = confidence
         self.session = None
@@ -38,6 +49,18 @@ class TruckDetector:
         if self.session is not None:
             return True
 
+        with TruckDetector._load_lock:
+            if TruckDetector._shared_session is None and not self._create_session():
+                return False
+        
+        self.session = TruckDetector._shared_session
+        self.input_name = self.session.get_inputs()[0].name
+        self.input_shape = self.session.get_inputs()[0].shape  # [1, 3, H, W]
+        return True
+
+    @classmethod
+    def _create_session(cls) -> bool:
+        """Create the shared ONNX Runtime session (caller holds _load_lock)"""
         try:
             import onnxruntime as ort
             
@@ -48,9 +71,10 @@ class TruckDetector:
             if not model_path.exists():
                 pt_path = settings.models_dir / "car_detect" / "yolo11n.pt"
                 if pt_path.exists():
-                    logger.warning(f"ONNX model not found. Please export: python -c \"from ultralytics import YOLO; YOLO('{pt_path}').export(format='onnx')\"")
+                    logger.warning("ONNX model not found. Please run: python -m backend.model_process.utils.download_models")
                     return False
                 else:
+                    # Fetched by the startup hook (server lifespan); a later detect() retries the load
                     logger.error("No YOLO model found. Download yolo11n.onnx to models/car_detect/")
                     return False
             
@@ -60,9 +84,7 @@ class TruckDetector:
             if ort.get_device() == 'GPU':
                 providers.insert(0, 'CUDAExecutionProvider')
             
-            self.session = ort.InferenceSession(str(model_path), providers=providers)
-            self.input_name = self.session.get_inputs()[0].name
-            self.input_shape = self.session.get_inputs()[0].shape  # [1, 3, H, W]
+            cls._shared_session = ort.InferenceSession(str(model_path), providers=providers)
             
             logger.info(f"Loaded ONNX model: {model_path.name}")
             return True
@@ -114,54 +136,50 @@ class TruckDetector:
         output = outputs[0]  # Remove batch: [84, 8400]
         predictions = output.T  # Transpose: [8400, 84]
         
-        detections = []
+        # Score every prediction at once (skip first 4 bbox values)
+        class_scores = predictions[:, 4:]
+        class_ids = class_scores.argmax(axis=1)
+        confidences = class_scores[np.arange(len(class_ids)), class_ids]
         
-        for pred in predictions:
-            # Get class scores (skip first 4 bbox values)
-            class_scores = pred[4:]
-            class_id = np.argmax(class_scores)
-            confidence = class_scores[class_id]
-            
-            # Filter by confidence and target classes
-            if confidence < self.confidence or class_id not in TARGET_CLASSES:
-                continue
-            
-            # Get bbox (center format)
-            cx, cy, w, h = pred[:4]
-            
-            # Convert to corner format
-            x1 = cx - w / 2
-            y1 = cy - h / 2
-            x2 = cx + w / 2
-            y2 = cy + h / 2
-            
-            # Remove padding and scale back to original size
-            pad_w, pad_h = pad
-            x1 = (x1 - pad_w) / scale
-            y1 = (y1 - pad_h) / scale
-            x2 = (x2 - pad_w) / scale
-            y2 = (y2 - pad_h) / scale
-            
-            # Clip to image bounds
-            orig_h, orig_w = orig_shape[:2]
-            x1 = max(0, min(x1, orig_w))
-            y1 = max(0, min(y1, orig_h))
-            x2 = max(0, min(x2, orig_w))
-            y2 = max(0, min(y2, orig_h))
-            
-            detections.append({
-                "bbox": [int(x1), int(y1), int(x2), int(y2)],
-                "confidence": float(confidence),
-                "class": COCO_CLASSES[class_id],
-                "class_id": int(class_id)
-            })
+        # Filter by confidence and target classes
+        keep = (confidences >= self.confidence) & np.isin(class_ids, TARGET_CLASSES)
+        if not keep.any():
+            return []
         
         # NMS - keep only best detection
-        if detections:
-            detections.sort(key=lambda x: x["confidence"], reverse=True)
-            return [detections[0]]  # Return best only
+        best = np.flatnonzero(keep)[confidences[keep].argmax()]
+        class_id = int(class_ids[best])
+        confidence = confidences[best]
+        
+        # Get bbox (center format)
+        cx, cy, w, h = predictions[best, :4]
+        
+        # Convert to corner format
+        x1 = cx - w / 2
+        y1 = cy - h / 2
+        x2 = cx + w / 2
+        y2 = cy + h / 2
+        
+        # Remove padding and scale back to original size
+        pad_w, pad_h = pad
+        x1 = (x1 - pad_w) / scale
+        y1 = (y1 - pad_h) / scale
+        x2 = (x2 - pad_w) / scale
+        y2 = (y2 - pad_h) / scale
+        
+        # Clip to image bounds
+        orig_h, orig_w = orig_shape[:2]
+        x1 = max(0, min(x1, orig_w))
+        y1 = max(0, min(y1, orig_h))
+        x2 = max(0, min(x2, orig_w))
+        y2 = max(0, min(y2, orig_h))
         
-        return []
+        return [{
+            "bbox": [int(x1), int(y1), int(x2), int(y2)],
+            "confidence": float(confidence),
+            "class": COCO_CLASSES[class_id],
+            "class_id": class_id
+        }]
 
     def detect(self, frame: np.ndarray) -> Dict[str, Any]:
         """
@@ -181,7 +199,8 @@ class TruckDetector:
             blob, scale, pad = self._preprocess(frame)
             
             # Inference
-            outputs = self.session.run(None, {self.input_name: blob})
+            with TruckDetector._run_lock:
+                outputs = self.session.run(None, {self.input_name: blob})
             
             # Postprocess
             detections = self._postprocess(outputs[0], scale, pad, frame.shape)
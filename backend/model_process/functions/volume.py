@@ -1,12 +1,32 @@
 
+import asyncio
 import logging
 from typing import Dict, Any, Optional
 from pathlib import Path
-import httpx
-from backend.model_process.config import MODEL_API_URL
+from backend.model_process.config import MODEL_API_URL, get_model_client
 
 logger = logging.getLogger(__name__)
 
+
+def _read_bytes(path: Path) -> Optional[bytes]:
+    try:
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+async def read_volume_inputs(*paths: Optional[Path]) -> Dict[str, bytes]:
+    """
+    Read volume estimation inputs concurrently in worker threads.
+    
+    Returns:
+        str(path) -> bytes for every path that could be read (None and
+        unreadable paths are skipped)
+    """
+    paths = list(dict.fromkeys(Path(p) for p in paths if p))
+    contents = await asyncio.gather(*(asyncio.to_thread(_read_bytes, p) for p in paths))
+    return {str(p): data for p, data in zip(paths, contents) if data is not None}
+
 class VolumeDetector:
     ENDPOINT = "/estimate_volume"
     
@@ -22,13 +42,18 @@ class VolumeDetector:
         top_calib_path: Path,
         dx: float = 0.05,
         threshold: int = 30,
-        step_px: int = 5
+        step_px: int = 5,
+        preloaded: Optional[Dict[str, bytes]] = None
     ) -> Dict[str, Any]:
         """
         Estimate volume using Top and Side views + Calibration.
+        
+        preloaded maps str(path) -> file bytes for inputs the caller already
+        read (see read_volume_inputs); the rest are read here.
         """
         
-        # Validate existence
+        # Validate existence (files already read by the caller are known to exist)
+        preloaded = preloaded or {}
         files_map = {
             "side_img": side_image_path,
             "top_fg": top_fg_image_path,
@@ -38,7 +63,7 @@ class VolumeDetector:
         }
         
         for name, path in files_map.items():
-            if not path.exists():
+            if str(path) not in preloaded and not path.exists():
                 error_msg = f"Missing file for volume detection: {name} -> {path}"
                 logger.error(error_msg)
                 return {"success": False, "error": error_msg}
@@ -47,56 +72,56 @@ class VolumeDetector:
         headers = {"accept": "application/json"}
         
         try:
-            # Open files
-            file_handles = []
-            try:
-                files = {
-                    "image": ("side.jpg", open(side_image_path, "rb"), "image/jpeg"),
-                    "img_fg": ("top_fg.jpg", open(top_fg_image_path, "rb"), "image/jpeg"),
-                    "img_bg": ("top_bg.jpg", open(top_bg_image_path, "rb"), "image/jpeg"),
-                    "calib_side": ("calib_side.json", open(side_calib_path, "rb"), "application/json"),
-                    "calib_topdown": ("calib_topdown.json", open(top_calib_path, "rb"), "application/json"),
-                }
-                
-                for _, (_, f_obj, _) in files.items():
-                    file_handles.append(f_obj)
+            # Read whatever was not prefetched, off the event loop
+            missing = [p for p in files_map.values() if str(p) not in preloaded]
+            contents = {**preloaded, **await read_volume_inputs(*missing)}
+            unreadable = [name for name, path in files_map.items() if str(path) not in contents]
+            if unreadable:
+                error_msg = f"Failed to read file for volume detection: {', '.join(unreadable)}"
+                logger.error(error_msg)
+                return {"success": False, "error": error_msg}
 
-                data = {
-                    "dx": str(dx),
-                    "threshold": str(threshold),
-                    "step_px": str(step_px)
-                }
+            files = {
+                "image": ("side.jpg", contents[str(side_image_path)], "image/jpeg"),
+                "img_fg": ("top_fg.jpg", contents[str(top_fg_image_path)], "image/jpeg"),
+                "img_bg": ("top_bg.jpg", contents[str(top_bg_image_path)], "image/jpeg"),
+                "calib_side": ("calib_side.json", contents[str(side_calib_path)], "application/json"),
+                "calib_topdown": ("calib_topdown.json", contents[str(top_calib_path)], "application/json"),
+            }
 
-                logger.info(f"Sending volume estimation request to {url}")
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.post(url, files=files, data=data, headers=headers)
+            data = {
+                "dx": str(dx),
+                "threshold": str(threshold),
+                "step_px": str(step_px)
+            }
 
-                if response.status_code == 200:
-                    result = response.json()
-                    vol = result.get("volume")
-                    
-                    # Handle case where volume is returned as string or number
-                    if isinstance(vol, str):
-                        try: vol = float(vol)
-                        except: vol = 0.0
-                        
-                    logger.info(f"Volume estimation success: {vol} m3")
-                    return {
-                        "success": True,
-                        "volume": vol,
-                        "raw": result
-                    }
-                else:
-                    logger.error(f"Volume API Error {response.status_code}: {response.text}")
-                    return {
-                        "success": False, 
-                        "error": f"API Error {response.status_code}",
-                        "details": response.text
-                    }
+            logger.info(f"Sending volume estimation request to {url}")
+            response = await get_model_client().post(
+                url, files=files, data=data, headers=headers, timeout=self.timeout
+            )
 
-            finally:
-                for f in file_handles:
-                    f.close()
+            if response.status_code == 200:
+                result = response.json()
+                vol = result.get("volume")
+                
+                # Handle case where volume is returned as string or number
+                if isinstance(vol, str):
+                    try: vol = float(vol)
+                    except: vol = 0.0
+                    
+                logger.info(f"Volume estimation success: {vol} m3")
+                return {
+                    "success": True,
+                    "volume": vol,
+                    "raw": result
+                }
+            else:
+                logger.error(f"Volume API Error {response.status_code}: {response.text}")
+                return {
+                    "success": False, 
+                    "error": f"API Error {response.status_code}",
+                    "details": response.text
+                }
 
 
         except Exception as e:
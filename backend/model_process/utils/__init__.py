@@ -9,10 +9,13 @@ from backend.model_process.utils.background import (
     get_background_for_camera,
     capture_background_if_empty,
 )
+from backend.model_process.utils.image_io import read_image, link_or_copy
 
 __all__ = [
     'BackgroundManager',
     'background_manager', 
     'get_background_for_camera',
     'capture_background_if_empty',
+    'read_image',
+    'link_or_copy',
 ]
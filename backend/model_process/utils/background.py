@@ -5,7 +5,9 @@ Captures background images from volume_top_down cameras when no car is detected.
 Updates backgrounds every hour and stores in database/backgrounds folder.
 """
 
+import os
 import asyncio
+import fnmatch
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -16,7 +18,7 @@ import numpy as np
 
 from backend.settings import settings
 from backend.model_process.functions.truck import TruckDetector
-from backend.camera.capture import suppress_ffmpeg_stderr
+from backend.camera.capture import suppress_ffmpeg_stderr, rtsp_capture_options
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +37,7 @@ class BackgroundManager:
             cls._instance._detector = None
             cls._instance._scheduler = None
             cls._instance._current_interval_hours = 1
+            cls._instance._listing = None
         return cls._instance
     
     @property
@@ -63,15 +66,35 @@ class BackgroundManager:
         # Sanitize camera name for matching (same as in save_background)
         safe_name = camera_name.replace(" ", "_").replace("/", "-")
         
+        names = self._list_backgrounds()
+        
         # Look for backgrounds with new pattern: background_{cam_name}_{timestamp}.jpg
-        pattern = f"background_{safe_name}_*.jpg"
-        bgs = sorted(self.backgrounds_dir.glob(pattern), reverse=True)
-        if bgs:
-            return bgs[0]
+        # (names are already sorted newest-first)
+        bgs = fnmatch.filter(names, f"background_{safe_name}_*.jpg")
+        if not bgs:
+            # Fallback: try any background file
+            bgs = fnmatch.filter(names, "background_*.jpg")
+        return self.backgrounds_dir / bgs[0] if bgs else None
+    
+    def _list_backgrounds(self) -> list:
+        """
+        File names in the backgrounds directory, sorted in reverse.
+        
+        The listing is cached and only re-scanned when the directory's mtime
+        changes (saving or deleting a background updates it), so checkouts
+        cost one stat instead of two globs.
+        """
+        bg_dir = self.backgrounds_dir
+        try:
+            key = (str(bg_dir), os.stat(bg_dir).st_mtime_ns)
+        except FileNotFoundError:
+            return []
         
-        # Fallback: try any background file
-        bgs = sorted(self.backgrounds_dir.glob("background_*.jpg"), reverse=True)
-        return bgs[0] if bgs else None
+        if self._listing is None or self._listing[0] != key:
+            with os.scandir(bg_dir) as it:
+                names = sorted((e.name for e in it if e.is_file()), reverse=True)
+            self._listing = (key, names)
+        return self._listing[1]
     
     def save_background(self, camera_name: str, image: Any) -> str:
         """
@@ -171,17 +194,8 @@ class BackgroundManager:
                 return {"success": False, "error": "No stream URI"}
             
             # Capture frame using OpenCV with robust RTSP options
-            transport = camera.get('transport_mode', 'tcp').lower()
-            if transport not in ['tcp', 'udp']:
-                transport = 'tcp'
-                
-            os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = (
-                f"rtsp_transport;{transport}|"
-                "fflags;discardcorrupt|"
-                "err_detect;ignore_err|"
-                "analyzeduration;1000000|"
-                "probesize;1000000"
-            )
+            transport = camera.get('transport_mode', 'tcp') or 'tcp'
+            os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = rtsp_capture_options(transport)
             
             with suppress_ffmpeg_stderr():
                 cap = cv2.VideoCapture(stream_uri, cv2.CAP_FFMPEG)
@@ -391,11 +405,13 @@ async def capture_background_if_empty(camera_id: str, frame: Any) -> bool:
     Returns:
         True if background was saved
     """
-    # Check if car is detected
-    result = background_manager.detector.detect(frame)
+    # Check if car is detected. The full-resolution frame is passed as-is
+    # (it is what gets saved); _preprocess already resizes straight to the
+    # model input, so both inference and the JPEG encode run off the loop.
+    result = await asyncio.to_thread(background_manager.detector.detect, frame)
     
     if result.get("detected"):
         return False
     
     # No car - save as background
-    return background_manager.save_background(camera_id, frame)
+    return await asyncio.to_thread(background_manager.save_background, camera_id, frame)
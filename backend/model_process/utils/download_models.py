@@ -5,9 +5,13 @@ Downloads required AI model weights to backend/model_process/models/
 Now uses ONNX format for lightweight deployment (no PyTorch required).
 """
 import asyncio
+import hashlib
 import httpx
+import os
+import socket
 import sys
 from pathlib import Path
+from urllib.parse import urlsplit
 
 # Model paths - in backend/model_process/models folder
 def get_models_base() -> Path:
@@ -19,57 +23,148 @@ def get_models_base() -> Path:
 
 MODELS_BASE = get_models_base()
 
-# ONNX models for lightweight deployment
-# Note: YOLO11n ONNX is ~22MB vs PyTorch ~6MB, but avoids 2GB torch dependency!
+# ONNX models for lightweight deployment: path -> (url, expected SHA-256, size in bytes)
+# Note: YOLO11n ONNX is ~11MB vs PyTorch ~6MB, but avoids 2GB torch dependency!
+# Downloads must match the hash; an existing file that doesn't is kept (it may be
+# a local export) unless it is shorter than the release, i.e. a truncated download.
 MODELS = {
     # Primary: ONNX format (no PyTorch required)
-    "car_detect/yolo11n.onnx": "https://github.com/ultralytics/assets/releases/download/v8.3.0/yolo11n.onnx",
+    "car_detect/yolo11n.onnx": (
+        "https://github.com/ultralytics/assets/releases/download/v8.3.0/yolo11n.onnx",
+        "634279b40c07c6391472c51ad45b81ebc48706a9a1fe72dd3396322acd0c053b",
+        10930182,
+    ),
 }
 
+# Hosts GitHub release downloads redirect to (resolved early, see _warm_dns)
+REDIRECT_HOSTS = ("objects.githubusercontent.com", "release-assets.githubusercontent.com")
+
+# Streamed download chunk size (fewer iterator turns / write calls than httpx's default)
+READ_CHUNK = 128 * 1024
+WRITE_BUFFER = 1024 * 1024
+
 # Backup: PyTorch format (only if user has ultralytics installed)
 MODELS_PYTORCH = {
-    "car_detect/yolo11n.pt": "https://github.com/ultralytics/assets/releases/download/v8.3.0/yolo11n.pt"
+    "car_detect/yolo11n.pt": (
+        "https://github.com/ultralytics/assets/releases/download/v8.3.0/yolo11n.pt",
+        "0ebbc80d4a7680d14987a577cd21342b65ecfd94632bd9a8da63ae6417644ee1",
+        5613764,
+    ),
 }
 
 
-async def download_model(name: str, url: str) -> bool:
-    path = MODELS_BASE / name
+def _sha256_file(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+async def download_model(client: httpx.AsyncClient, name: str, url: str, expected: str, size: int,
+                         base: Path = MODELS_BASE) -> bool:
+    path = base / name
     if path.exists():
-        print(f"[OK] {name} already exists.")
-        return True
+        # Hash the file itself (a few ms for these sizes) rather than trusting exists()
+        actual = await asyncio.to_thread(_sha256_file, path)
+        if actual == expected:
+            print(f"[OK] {name} already exists (verified).")
+            return True
+        if path.stat().st_size >= size:
+            # Not the release file, but complete - e.g. exported locally; keep it
+            print(f"[!] {name} does not match the release SHA-256 - keeping the existing file")
+            return True
+        # Shorter than the release: left behind by an older, non-atomic download
+        print(f"[!] {name} is truncated - re-downloading")
+        path.unlink()
 
     print(f"[...] Downloading {name} from {url}")
     path.parent.mkdir(parents=True, exist_ok=True)
+    # Download into a .part file and rename on success, so an interrupted
+    # download is never mistaken for a complete model and can be resumed.
+    part_path = path.with_suffix(path.suffix + ".part")
+    resume_from = part_path.stat().st_size if part_path.exists() else 0
+    headers = {"Range": f"bytes={resume_from}-"} if resume_from else None
     
     try:
-        async with httpx.AsyncClient(timeout=600.0) as client:
-            async with client.stream("GET", url, follow_redirects=True) as response:
-                response.raise_for_status()
-                total = int(response.headers.get("content-length", 0))
-                downloaded = 0
-                with open(path, "wb") as f:
-                    async for chunk in response.aiter_bytes():
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total > 0:
-                            pct = downloaded * 100 // total
-                            print(f"\r[...] {name}: {pct}%", end="", flush=True)
-                print()  # New line after progress
-        print(f"[Success] {name} downloaded.")
+        async with client.stream("GET", url, headers=headers, follow_redirects=True) as response:
+            if response.status_code == 416:
+                # Stale/oversized partial file - start over next run
+                part_path.unlink()
+            response.raise_for_status()
+            resumed = response.status_code == 206
+            digest = hashlib.sha256()
+            if resume_from and resumed:
+                print(f"[...] Resuming {name} at {resume_from // 1024} KiB")
+                with open(part_path, "rb") as existing:
+                    digest = await asyncio.to_thread(hashlib.file_digest, existing, "sha256")
+            downloaded = resume_from if resumed else 0
+            total = int(response.headers.get("content-length", 0))
+            if total:
+                total += downloaded
+            # 1 MiB userspace buffer: several chunks coalesce into one write() syscall
+            with open(part_path, "ab" if resumed else "wb", buffering=WRITE_BUFFER) as f:
+                async for chunk in response.aiter_bytes(chunk_size=READ_CHUNK):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    downloaded += len(chunk)
+                    if total > 0:
+                        pct = downloaded * 100 // total
+                        print(f"\r[...] {name}: {pct}%", end="", flush=True)
+            print()  # New line after progress
+        actual = digest.hexdigest()
+        if actual != expected:
+            part_path.unlink()
+            raise ValueError(f"SHA-256 mismatch (got {actual[:12]}..., expected {expected[:12]}...)")
+        os.replace(part_path, path)
+        print(f"[Success] {name} downloaded (sha256 {actual[:12]}...).")
         return True
     except Exception as e:
+        # Keep the .part file so the next run resumes from where this one stopped
         print(f"[Error] Failed to download {name}: {e}")
-        if path.exists():
-            path.unlink()  # Remove partial download
         return False
 
 
+async def _warm_dns(hosts: set[str]) -> None:
+    """Resolve hosts ahead of use so the OS resolver cache is warm by the time
+    httpx connects (the CDN host is only reached after the GitHub redirect)."""
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(
+        *(loop.getaddrinfo(host, 443, type=socket.SOCK_STREAM) for host in hosts),
+        return_exceptions=True,
+    )
+
+
+async def download_all(base: Path = MODELS_BASE) -> list[bool]:
+    """Download every entry of MODELS into `base` (existing files are skipped)."""
+    hosts = {urlsplit(url).hostname for url, _, _ in MODELS.values()} | set(REDIRECT_HOSTS)
+    dns_task = asyncio.create_task(_warm_dns(hosts - {None}))
+    # One client for every model so the GitHub/CDN connections stay warm
+    async with httpx.AsyncClient(
+        timeout=httpx.Timeout(600.0, connect=15.0),
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=8),
+        transport=httpx.AsyncHTTPTransport(retries=3),
+    ) as client:
+        tasks = [download_model(client, name, url, sha256, size, base) for name, (url, sha256, size) in MODELS.items()]
+        results = await asyncio.gather(*tasks)
+    await dns_task
+    return results
+
+
+def ensure_models(base: Path = MODELS_BASE) -> bool:
+    """
+    Blocking first-run helper: fetch any missing models into `base`.
+    Must be called from a worker thread (not from inside a running event loop).
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return all(asyncio.run(download_all(base)))
+    raise RuntimeError("ensure_models() cannot run inside an event loop")
+
+
 async def main():
     print(f"Downloading ONNX models to: {MODELS_BASE.absolute()}")
     print("=" * 50)
     
-    tasks = [download_model(name, url) for name, url in MODELS.items()]
-    results = await asyncio.gather(*tasks)
+    results = await download_all()
     
     success = sum(results)
     print("=" * 50)
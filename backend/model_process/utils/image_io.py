@@ -0,0 +1,58 @@
+"""
+Image file helpers.
+
+Decodes JPEG/PNG evidence images straight from a read-only memory map, so the
+file bytes are not first copied into an intermediate buffer the way
+cv2.imread does, and stores evidence copies as hard links where possible.
+"""
+
+import os
+import mmap
+import shutil
+import logging
+from pathlib import Path
+from typing import Optional, Union
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def read_image(path: Union[str, Path]) -> Optional[np.ndarray]:
+    """
+    Read an image as a BGR array (drop-in for cv2.imread).
+
+    Args:
+        path: Image file path
+
+    Returns:
+        Decoded image, or None if the file is missing, empty or undecodable
+    """
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            buf = np.frombuffer(mm, dtype=np.uint8)
+            image = cv2.imdecode(buf, cv2.IMREAD_COLOR)
+            del buf  # release the buffer export so the map can close
+            return image
+    except (OSError, ValueError) as e:
+        logger.debug(f"Failed to read image {path}: {e}")
+        return None
+
+
+def link_or_copy(src: Union[str, Path], dst: Union[str, Path]) -> None:
+    """
+    Place an evidence copy of src at dst.
+
+    Captured images are written once and never modified, so a hard link is
+    used when both paths share a filesystem (no bytes moved). Otherwise falls
+    back to shutil.copy2, which uses the platform's in-kernel copy where
+    available. An existing dst is unlinked first rather than written through:
+    it may be a hard link from an earlier run, and truncating it in place
+    would rewrite the evidence file it shares an inode with.
+    """
+    Path(dst).unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
@@ -2,6 +2,7 @@
 import os
 import sys
 import shutil
+import asyncio
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -88,7 +89,16 @@ def create_app() -> FastAPI:
         thread = threading.Thread(target=initialize_backend, daemon=True)
         thread.start()
         logger.info("Main backend initialization moved to background thread")
+        # First run: fetch AI models missing from models_dir (not bundled with the installer)
+        models_task = asyncio.create_task(fetch_missing_models())
         yield
+        models_task.cancel()
+        from backend.workflow.checkout.logic import CheckOutService
+        await CheckOutService.shutdown()
+        from backend.sync_process.sync.proxy import close_master_client
+        await close_master_client()
+        from backend.model_process.config import close_model_client
+        await close_model_client()
 
     app = FastAPI(
         title=settings.api_title,
@@ -185,6 +195,16 @@ def create_app() -> FastAPI:
 app = create_app()
 
 
+async def fetch_missing_models():
+    """Download missing model weights in a worker thread before detection needs them."""
+    try:
+        from backend.model_process.utils.download_models import ensure_models
+        if not await asyncio.to_thread(ensure_models, settings.models_dir):
+            logger.warning("Some AI models could not be downloaded; vehicle detection stays disabled until they are present")
+    except Exception as e:
+        logger.error(f"Model download failed: {e}")
+
+
 def initialize_backend():
     """Initialize backend services (schedulers, data sync, etc.)"""
     try:
@@ -75,6 +75,10 @@ class Settings(BaseSettings):
         default="https://thpttl12t1--truck-api-fastapi-app.modal.run",
         description="Modal.run API endpoint for AI functions"
     )
+    plate_prefilter: bool = Field(
+        default=False,
+        description="Skip remote plate OCR on checkout frames where a local Haar plate cascade finds no candidate"
+    )
     
     # ==========================================================================
     # Authentication
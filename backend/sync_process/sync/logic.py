@@ -7,7 +7,6 @@ Handles:
 - Data synchronization payloads
 """
 
-import httpx
 import asyncio
 import logging
 import os
@@ -23,6 +22,7 @@ from zeroconf import IPVersion, ServiceInfo, Zeroconf, ServiceBrowser
 
 from backend.schemas import SyncPayload
 from backend.settings import settings
+from backend.sync_process.sync.proxy import get_master_client
 
 logger = logging.getLogger(__name__)
 
@@ -326,14 +326,14 @@ class SyncLogic:
             return False
             
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                url = self.remote_url.rstrip('/')
-                response = await client.post(
-                    f"{url}/api/sync/receive",
-                    json=payload.model_dump(),
-                    headers={"Content-Type": "application/json"}
-                )
-                return response.status_code == 200
+            # Pushes fire on every local change; reuse the pooled keep-alive client
+            url = self.remote_url.rstrip('/')
+            response = await get_master_client().post(
+                f"{url}/api/sync/receive",
+                content=payload.model_dump_json(),
+                headers={"Content-Type": "application/json"}
+            )
+            return response.status_code == 200
         except Exception as e:
             logger.warning(f"[Sync] Push to remote failed: {e}")
             return False
@@ -5,15 +5,19 @@ Provides helper functions for proxying HTTP requests to the Master node
 when running in Client mode.
 """
 
+import os
 import httpx
 import json
 import logging
 import time
 import socket
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+from pydantic_core import to_json
+
 from backend.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -23,6 +27,9 @@ _sync_config_cache = None
 _last_config_load_time = 0
 CONFIG_CACHE_TTL = 5.0  # seconds
 
+# Keep-alive client shared by Master sync calls (created on first use)
+_master_client: Optional[httpx.AsyncClient] = None
+
 
 def get_sync_config() -> Dict[str, Any]:
     """Read sync configuration from file with 5s caching."""
@@ -47,6 +54,25 @@ def get_sync_config() -> Dict[str, Any]:
     return config
 
 
+def get_master_client() -> httpx.AsyncClient:
+    """Get the shared Master client so sync calls reuse pooled connections."""
+    global _master_client
+    if _master_client is None or _master_client.is_closed:
+        _master_client = httpx.AsyncClient(
+            timeout=5.0,
+            limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=60),
+        )
+    return _master_client
+
+
+async def close_master_client():
+    """Close the shared Master client (app shutdown)."""
+    global _master_client
+    if _master_client is not None:
+        await _master_client.aclose()
+        _master_client = None
+
+
 def is_client_mode() -> bool:
     """Check if this node is running in client mode (not destination/master)."""
     config = get_sync_config()
@@ -79,14 +105,13 @@ async def proxy_get(
     try:
         logger.info(f"[Proxy] Connecting to Master: {url}")
         
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.get(url, headers=headers)
-            if response.status_code == 200:
-                logger.info(f"[Proxy GET] Success: {url}")
-                return response.json()
-            else:
-                logger.warning(f"[Proxy GET] Master returned {response.status_code} for {url}. Result=None.")
-                return None
+        response = await get_master_client().get(url, headers=headers, timeout=timeout)
+        if response.status_code == 200:
+            logger.info(f"[Proxy GET] Success: {url}")
+            return response.json()
+        else:
+            logger.warning(f"[Proxy GET] Master returned {response.status_code} for {url}. Result=None.")
+            return None
                 
     except httpx.ConnectTimeout:
         logger.error(f"[Proxy] Connection TIMEOUT connecting to {url}")
@@ -116,14 +141,15 @@ async def proxy_post(
 
     try:
         url = master_url.rstrip('/') + endpoint
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(url, json=data, headers=headers)
-            if response.status_code in (200, 201):
-                logger.info(f"[Proxy POST] Success: {url}")
-                return response.json()
-            else:
-                logger.warning(f"[Proxy POST] Master returned {response.status_code} for {url}. Body: {response.text[:100]}")
-                return None
+        response = await get_master_client().post(
+            url, content=to_json(data), headers=headers, timeout=timeout
+        )
+        if response.status_code in (200, 201):
+            logger.info(f"[Proxy POST] Success: {url}")
+            return response.json()
+        else:
+            logger.warning(f"[Proxy POST] Master returned {response.status_code} for {url}. Body: {response.text[:100]}")
+            return None
     except Exception as e:
         logger.error(f"Proxy POST failed for {endpoint}: {e}")
         return None
@@ -146,14 +172,15 @@ async def proxy_put(
 
     try:
         url = master_url.rstrip('/') + endpoint
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.put(url, json=data, headers=headers)
-            if response.status_code == 200:
-                logger.info(f"[Proxy PUT] Success: {url}")
-                return response.json()
-            else:
-                logger.warning(f"[Proxy PUT] Master returned {response.status_code} for {url}. Body: {response.text[:100]}")
-                return None
+        response = await get_master_client().put(
+            url, content=to_json(data), headers=headers, timeout=timeout
+        )
+        if response.status_code == 200:
+            logger.info(f"[Proxy PUT] Success: {url}")
+            return response.json()
+        else:
+            logger.warning(f"[Proxy PUT] Master returned {response.status_code} for {url}. Body: {response.text[:100]}")
+            return None
     except Exception as e:
         logger.error(f"Proxy PUT failed for {endpoint}: {e}")
         return None
@@ -175,9 +202,8 @@ async def proxy_delete(
 
     try:
         url = master_url.rstrip('/') + endpoint
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.delete(url, headers=headers)
-            return response.status_code == 200
+        response = await get_master_client().delete(url, headers=headers, timeout=timeout)
+        return response.status_code == 200
     except Exception as e:
         logger.error(f"Proxy DELETE failed for {endpoint}: {e}")
         return False
@@ -212,21 +238,14 @@ async def upload_folder_to_master(
         date_folder = folder_path.parent.name  # e.g., "dd-mm-yyyy"
         source_pc = socket.gethostname()
         
-        # Collect all files in the folder
-        files_to_upload = []
-        for file_path in folder_path.iterdir():
-            if file_path.is_file():
-                files_to_upload.append(file_path)
+        # Collect all files in the folder (scandir's entry type avoids a stat per file)
+        with os.scandir(folder_path) as entries:
+            files_to_upload = [Path(e.path) for e in entries if e.is_file()]
         
         if not files_to_upload:
             logger.warning(f"No files found in folder: {folder_path}")
             return None
         
-        # Prepare multipart files
-        files = []
-        for fp in files_to_upload:
-            files.append(("files", (fp.name, open(fp, "rb"), "application/octet-stream")))
-        
         # Prepare form data
         data = {
             "folder_name": folder_name,
@@ -236,20 +255,22 @@ async def upload_folder_to_master(
         
         url = master_url.rstrip('/') + "/api/sync/files/upload-folder"
         
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(url, data=data, files=files)
-            
-            # Close file handles
-            for _, file_tuple in files:
-                file_tuple[1].close()
-            
-            if response.status_code == 200:
-                result = response.json()
-                logger.info(f"[FileSync] Uploaded folder to master: {folder_name} ({len(files_to_upload)} files)")
-                return result
-            else:
-                logger.warning(f"[FileSync] Upload failed with status {response.status_code}: {response.text}")
-                return None
+        # httpx streams the open files into the multipart body; the exit
+        # stack closes every handle even if the upload raises
+        with ExitStack() as stack:
+            files = [
+                ("files", (fp.name, stack.enter_context(open(fp, "rb")), "application/octet-stream"))
+                for fp in files_to_upload
+            ]
+            response = await get_master_client().post(url, data=data, files=files, timeout=timeout)
+        
+        if response.status_code == 200:
+            result = response.json()
+            logger.info(f"[FileSync] Uploaded folder to master: {folder_name} ({len(files_to_upload)} files)")
+            return result
+        else:
+            logger.warning(f"[FileSync] Upload failed with status {response.status_code}: {response.text}")
+            return None
                 
     except Exception as e:
         logger.error(f"[FileSync] Failed to upload folder to master: {e}")
@@ -297,12 +318,11 @@ async def sync_folder_and_update_record(
                     timestamp=datetime.now().isoformat()
                 )
                 
-                async with httpx.AsyncClient(timeout=5.0) as client:
-                    await client.post(
-                        f"{master_url.rstrip('/')}/api/sync/receive",
-                        json=payload.model_dump(),
-                        headers={"Content-Type": "application/json"}
-                    )
+                await get_master_client().post(
+                    f"{master_url.rstrip('/')}/api/sync/receive",
+                    content=payload.model_dump_json(),
+                    headers={"Content-Type": "application/json"}
+                )
                     
         except Exception as e:
             logger.error(f"Failed to update folder_path on master: {e}")
@@ -8,6 +8,7 @@ Provides endpoints for:
 - Getting check-in status
 """
 
+import os
 import time
 import json
 import httpx
@@ -23,18 +24,23 @@ from typing import Optional, List, Dict, Any
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from pydantic_core import to_json, from_json
 
 from backend.data_process.user.api import get_current_user
 from backend.schemas import User as UserSchema
 from backend.workflow.checkin.logic import get_checkin_service, CheckInResult
 from backend.camera.state import cameras as active_cameras
 from backend.data_process import get_registered_cars
-from backend.workflow.config import LocationTag
+from backend.workflow.config import LocationTag, SIDE_VIEW_FUNCTIONS
 from backend.settings import settings
 
 
 checkin_router = APIRouter(prefix="/api/checkin", tags=["check-in"])
 
+# Test folders reprocessed at once by /test/process-all (each one is a few
+# round-trips to the external AI API, so keep the burst small)
+TEST_PROCESS_CONCURRENCY = 4
+
 
 # Request/Response Models
 class VerifyPlateRequest(BaseModel):
@@ -224,17 +230,24 @@ async def capture_and_process(
         images_to_process = []
         captured_paths = {}  # id -> path
 
+        # Reserve a temp file per captured frame
+        captured = []
         for cid, frame in zip(cam_ids, frames):
             if frame is None:
                 print(f"[API] Failed to capture frame for {cid}")
                 continue
 
-            # Save to temp
             with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
-                await asyncio.to_thread(cv2.imwrite, tmp.name, frame)
                 path = Path(tmp.name)
-                captured_paths[cid] = path
+            captured_paths[cid] = path
+            captured.append((cid, frame, path))
+
+        # Save to temp - the JPEG encodes are independent, run them together
+        await asyncio.gather(
+            *(asyncio.to_thread(cv2.imwrite, str(path), frame) for _, frame, path in captured)
+        )
 
+        for cid, frame, path in captured:
             # Get Info
             info = get_cam_info(cid)
             if info:
@@ -247,6 +260,8 @@ async def capture_and_process(
                         "cam_name": info["name"],
                         "functions": info["functions"],
                         "cam_id": cid,
+                        # Already decoded - the services skip re-reading the JPEG
+                        "frame": frame,
                     }
                 )
 
@@ -373,27 +388,18 @@ async def capture_and_process(
 
         volume_val = None
         volume_res = None
+        volume_error = None  # written once after the volume step
         if is_volume_loc and result.folder_path:
-            # Identify Side and Top images for volume
-            side_img = next(
-                (
-                    img
-                    for img in images_to_process
-                    if any(
-                        f in img["functions"]
-                        for f in ["volume_left_right", "wheel_detect", "color_detect"]
-                    )
-                ),
-                None,
-            )
-            top_img = next(
-                (
-                    img
-                    for img in images_to_process
-                    if "volume_top_down" in img["functions"]
-                ),
-                None,
-            )
+            # Identify Side and Top images for volume (single pass, first match wins)
+            roles = {}
+            for img in images_to_process:
+                funcs = img["functions"]
+                if any(f in funcs for f in SIDE_VIEW_FUNCTIONS):
+                    roles.setdefault("side", img)
+                if "volume_top_down" in funcs:
+                    roles.setdefault("top", img)
+            side_img = roles.get("side")
+            top_img = roles.get("top")
 
             if side_img and top_img:
                 from backend.model_process.control import orchestrator
@@ -471,18 +477,10 @@ async def capture_and_process(
                         else:
                             err = volume_res.get("error") if volume_res else "Unknown"
                             print(f"[API] Volume estimation failed: {err}")
-                            with open(
-                                folder / "volume_error.json", "w", encoding="utf-8"
-                            ) as f:
-                                json.dump(
-                                    {"error": err, "details": volume_res}, f, indent=4
-                                )
+                            volume_error = {"error": err, "details": volume_res}
                     except Exception as ve:
                         print(f"[API] Volume estimation exception: {ve}")
-                        with open(
-                            folder / "volume_error.json", "w", encoding="utf-8"
-                        ) as f:
-                            json.dump({"error": str(ve)}, f, indent=4)
+                        volume_error = {"error": str(ve)}
                 else:
                     msg = []
                     if not calib_side.exists():
@@ -492,25 +490,20 @@ async def capture_and_process(
                     if not bg_image:
                         msg.append("Missing Background Image")
                     print(f"[API] Volume Skipped: {', '.join(msg)}")
-                    with open(folder / "volume_error.json", "w", encoding="utf-8") as f:
-                        json.dump(
-                            {"error": "Volume Skipped", "reasons": msg}, f, indent=4
-                        )
+                    volume_error = {"error": "Volume Skipped", "reasons": msg}
             else:
                 msg = []
                 if not side_img:
                     msg.append("Missing Side Cam")
                 if not top_img:
                     msg.append("Missing Top Cam")
-                if result.folder_path:
-                    with open(
-                        Path(result.folder_path) / "volume_error.json",
-                        "w",
-                        encoding="utf-8",
-                    ) as f:
-                        json.dump(
-                            {"error": "Volume Skipped", "reasons": msg}, f, indent=4
-                        )
+                volume_error = {"error": "Volume Skipped", "reasons": msg}
+
+            if volume_error:
+                await asyncio.to_thread(
+                    (Path(result.folder_path) / "volume_error.json").write_bytes,
+                    to_json(volume_error, indent=4),
+                )
 
         # Cleanup temp files
         print("[API] Cleaning up temp files")
@@ -708,47 +701,57 @@ async def verify_plate(request: VerifyPlateRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _subdirs(path: Path) -> List[Path]:
+    """List the sub-folders of path (scandir's entry type avoids a stat each)."""
+    with os.scandir(path) as entries:
+        return [Path(e.path) for e in entries if e.is_dir()]
+
+
+def _read_status(car_folder: Path) -> Optional[Dict[str, Any]]:
+    """Parse the folder's checkin_status.json, or None if it has none."""
+    try:
+        return from_json((car_folder / "checkin_status.json").read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+def _scan_pending(car_history_dir: Path) -> List[Dict[str, Any]]:
+    """Collect check-ins awaiting verification (blocking directory walk)."""
+    pending = []
+
+    # Scan all date folders
+    for date_folder in _subdirs(car_history_dir):
+        # Scan all car folders
+        for car_folder in _subdirs(date_folder):
+            status_data = _read_status(car_folder)
+            if status_data and status_data.get("status") == "pending_verification":
+                pending.append(
+                    {
+                        "uuid": status_data.get("uuid"),
+                        "location_id": status_data.get("location_id"),
+                        "date": status_data.get("date"),
+                        "folder_path": str(car_folder),
+                        "plate_number": status_data.get("plate_number"),
+                        "color": status_data.get("color"),
+                        "wheel_count": status_data.get("wheel_count"),
+                        "status": status_data.get("status"),
+                        "created_at": status_data.get("created_at"),
+                    }
+                )
+
+    return pending
+
+
 @checkin_router.get("/pending")
 async def get_pending_verifications():
     """Get all check-ins pending verification"""
-    from pathlib import Path
-    import json
-
-    pending = []
     car_history_dir = settings.car_history_dir
 
     if not car_history_dir.exists():
         return {"pending": []}
 
-    # Scan all date folders
-    for date_folder in car_history_dir.iterdir():
-        if not date_folder.is_dir():
-            continue
-
-        # Scan all car folders
-        for car_folder in date_folder.iterdir():
-            if not car_folder.is_dir():
-                continue
-
-            status_file = car_folder / "checkin_status.json"
-            if status_file.exists():
-                with open(status_file, "r", encoding="utf-8") as f:
-                    status_data = json.load(f)
-
-                if status_data.get("status") == "pending_verification":
-                    pending.append(
-                        {
-                            "uuid": status_data.get("uuid"),
-                            "location_id": status_data.get("location_id"),
-                            "date": status_data.get("date"),
-                            "folder_path": str(car_folder),
-                            "plate_number": status_data.get("plate_number"),
-                            "color": status_data.get("color"),
-                            "wheel_count": status_data.get("wheel_count"),
-                            "status": status_data.get("status"),
-                            "created_at": status_data.get("created_at"),
-                        }
-                    )
+    # Walk the history tree off the event loop
+    pending = await asyncio.to_thread(_scan_pending, car_history_dir)
 
     return {"pending": pending, "count": len(pending)}
 
@@ -791,6 +794,24 @@ async def process_test_folder(folder_path: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _already_processed(car_folder: Path) -> bool:
+    """True if the folder has a checkin_status.json with AI results."""
+    existing = _read_status(car_folder)
+    return bool(existing and (existing.get("plate_number") or existing.get("color")))
+
+
+def _collect_unprocessed(date_folders: List[Path]) -> List[Path]:
+    """List car folders under date_folders that still need processing."""
+    car_folders = []
+    for date_folder in date_folders:
+        for car_folder in _subdirs(date_folder):
+            if _already_processed(car_folder):
+                print(f"[Test] Skipping already processed: {car_folder.name}")
+                continue
+            car_folders.append(car_folder)
+    return car_folders
+
+
 @checkin_router.post("/test/process-all")
 async def process_all_test_data(request: ProcessTestDataRequest = None):
     """
@@ -809,45 +830,43 @@ async def process_all_test_data(request: ProcessTestDataRequest = None):
 
     # Find date folders to process
     if request and request.date_folder:
-        date_folders = [car_history_dir / request.date_folder]
+        date_folder = car_history_dir / request.date_folder
+        if not date_folder.is_dir():
+            raise HTTPException(status_code=404, detail="Date folder not found")
+        date_folders = [date_folder]
     else:
-        date_folders = [f for f in car_history_dir.iterdir() if f.is_dir()]
-
-    for date_folder in date_folders:
-        if not date_folder.exists():
-            continue
-
-        # Process each car folder
-        for car_folder in date_folder.iterdir():
-            if not car_folder.is_dir():
-                continue
-
-            # Skip already processed folders (have checkin_status.json with results)
-            status_file = car_folder / "checkin_status.json"
-            if status_file.exists():
-                with open(status_file, "r") as f:
-                    existing = json.load(f)
-                    if existing.get("plate_number") or existing.get("color"):
-                        print(f"[Test] Skipping already processed: {car_folder.name}")
-                        continue
-
-            try:
-                print(f"[Test] Processing: {car_folder.name}")
-                result = await service.process_existing_folder(car_folder)
-
-                if result:
-                    results.append(
-                        {
-                            "folder": car_folder.name,
-                            "uuid": result.uuid,
-                            "plate_number": result.plate_number,
-                            "color": result.color,
-                            "wheel_count": result.wheel_count,
-                            "status": result.status,
-                        }
-                    )
-            except Exception as e:
-                errors.append({"folder": car_folder.name, "error": str(e)})
+        # Only existing folders by construction
+        date_folders = _subdirs(car_history_dir)
+
+    # Collect car folders up front (off the event loop) so skipped ones
+    # never spawn a task
+    car_folders = await asyncio.to_thread(_collect_unprocessed, date_folders)
+
+    semaphore = asyncio.Semaphore(TEST_PROCESS_CONCURRENCY)
+
+    async def process_folder(car_folder: Path):
+        async with semaphore:
+            print(f"[Test] Processing: {car_folder.name}")
+            return await service.process_existing_folder(car_folder)
+
+    outcomes = await asyncio.gather(
+        *(process_folder(f) for f in car_folders), return_exceptions=True
+    )
+
+    for car_folder, outcome in zip(car_folders, outcomes):
+        if isinstance(outcome, Exception):
+            errors.append({"folder": car_folder.name, "error": str(outcome)})
+        elif outcome:
+            results.append(
+                {
+                    "folder": car_folder.name,
+                    "uuid": outcome.uuid,
+                    "plate_number": outcome.plate_number,
+                    "color": outcome.color,
+                    "wheel_count": outcome.wheel_count,
+                    "status": outcome.status,
+                }
+            )
 
     await service.close()
 
@@ -869,7 +888,7 @@ async def get_checkin_status(folder_name: str, date_folder: Optional[str] = None
     if date_folder:
         search_dirs = [car_history_dir / date_folder]
     else:
-        search_dirs = [f for f in car_history_dir.iterdir() if f.is_dir()]
+        search_dirs = _subdirs(car_history_dir)
 
     for date_dir in search_dirs:
         car_folder = date_dir / folder_name
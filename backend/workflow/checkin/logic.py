@@ -1,19 +1,20 @@
 import logging
 import json
 import uuid
-import shutil
 import asyncio
-import cv2
+from functools import lru_cache
 import numpy as np
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 
+from pydantic_core import to_json
+
 from backend.model_process.control import orchestrator
+from backend.model_process.utils.image_io import read_image, link_or_copy
 from backend.data_process.history.logic import HistoryLogic
 from backend.data_process.location.logic import LocationLogic
 from backend.data_process.register_car.logic import RegisteredCarLogic
-from backend.data_process.register_car.logic import RegisteredCarLogic
 from backend.sync_process.sync.proxy import is_client_mode, upload_folder_to_master
 
 logger = logging.getLogger(__name__)
@@ -60,21 +61,33 @@ class CheckInService:
             location_name = self.location_logic.get_location_name(location_id)
 
             # 1. AI Detection on all images
-            tasks = []
+            # Decode each distinct path once, concurrently off the event loop
+            # (missing files decode to None); images that come with their
+            # in-memory "frame" (fresh captures) skip the disk round-trip
+            decoded = {
+                str(img_info["path"]): img_info["frame"]
+                for img_info in images
+                if img_info.get("frame") is not None
+            }
+            unique_paths = [
+                p for p in dict.fromkeys(str(img_info["path"]) for img_info in images)
+                if p not in decoded
+            ]
+            decoded.update(zip(
+                unique_paths,
+                await asyncio.gather(*(asyncio.to_thread(read_image, p) for p in unique_paths)),
+            ))
+            frames, functions_list = [], []
             for img_info in images:
-                path = img_info["path"]
-                funcs = img_info.get("functions", [])
-                if not path.exists():
-                    continue
-
-                # Use to_thread to avoid blocking event loop
-                frame = await asyncio.to_thread(cv2.imread, str(path))
+                frame = decoded[str(img_info["path"])]
                 if frame is not None:
-                    # Run functions in parallel for this frame
-                    tasks.append(self.orchestrator.process_image(frame, funcs))
+                    frames.append(frame)
+                    functions_list.append(img_info.get("functions", []))
 
-            # Gather all results
-            all_results_list = await asyncio.gather(*tasks)
+            # Run all frames' functions in one orchestrator pass
+            all_results_list = await self.orchestrator.process_images(frames, functions_list)
+            # Release the decoded frames before the slower folder/record work below
+            frames = decoded = frame = None
             results = {}
             for res_dict in all_results_list:
                 results.update(res_dict)
@@ -94,15 +107,16 @@ class CheckInService:
                 session_id, plate=plate_number, direction="in", location=location_name
             )
 
-            # Save individual model outputs as JSON
-            for func_name, res in results.items():
-                if func_name != "raw":
-                    with open(
-                        folder_path / f"model_{func_name}.json", "w", encoding="utf-8"
-                    ) as f:
-                        json.dump(res, f, indent=4)
+            # Save individual model outputs as JSON (serialized up front, written
+            # together with the image copies below)
+            json_writes = [
+                (folder_path / f"model_{func_name}.json", to_json(res, indent=4))
+                for func_name, res in results.items()
+                if func_name != "raw"
+            ]
 
             # 3. Save Images with custom naming: {cam_name}_{functions}.jpg
+            copy_ops = []
             for img_info in images:
                 path = img_info["path"]
                 cam_name = img_info.get("cam_name", "UnknownCam").replace(" ", "_")
@@ -110,8 +124,12 @@ class CheckInService:
 
                 ext = path.suffix or ".jpg"
                 new_name = f"{cam_name}_{funcs_str}{ext}"
-                if path.exists():
-                    shutil.copy2(path, folder_path / new_name)
+                if path.exists() and (path, folder_path / new_name) not in copy_ops:
+                    copy_ops.append((path, folder_path / new_name))
+            await asyncio.gather(
+                *(asyncio.to_thread(out.write_bytes, data) for out, data in json_writes),
+                *(asyncio.to_thread(link_or_copy, src, dst) for src, dst in copy_ops),
+            )
 
             # 4. Check Registration
             car = self.registered_logic.get_car_by_plate(plate_number)
@@ -149,8 +167,7 @@ class CheckInService:
             }
 
             status_file = folder_path / "checkin_status.json"
-            with open(status_file, "w", encoding="utf-8") as f:
-                json.dump(status_data, f, indent=4)
+            await asyncio.to_thread(status_file.write_bytes, to_json(status_data, indent=4))
 
             # --- SYNC FOLDER TO MASTER (if in Client mode) ---
             if is_client_mode():
@@ -166,9 +183,8 @@ class CheckInService:
                             )
 
                             # Update the synced record's folder_path on Master
-                            from backend.sync_process.sync.proxy import get_master_url
+                            from backend.sync_process.sync.proxy import get_master_url, get_master_client
                             from backend.schemas import SyncPayload
-                            import httpx
 
                             master_url = get_master_url()
                             if master_url:
@@ -181,12 +197,11 @@ class CheckInService:
                                     },
                                     timestamp=datetime.now().isoformat(),
                                 )
-                                async with httpx.AsyncClient(timeout=5.0) as client:
-                                    await client.post(
-                                        f"{master_url.rstrip('/')}/api/sync/receive",
-                                        json=payload.model_dump(),
-                                        headers={"Content-Type": "application/json"},
-                                    )
+                                await get_master_client().post(
+                                    f"{master_url.rstrip('/')}/api/sync/receive",
+                                    content=payload.model_dump_json(),
+                                    headers={"Content-Type": "application/json"},
+                                )
                         else:
                             logger.warning("[CheckIn] Failed to sync folder to Master")
                     except Exception as e:
@@ -233,7 +248,7 @@ class CheckInService:
         uuid_val = ""
         current_data = {}
         if status_file.exists():
-            with open(status_file, "r") as f:
+            with open(status_file, "r", encoding="utf-8") as f:
                 current_data = json.load(f)
                 uuid_val = current_data.get("uuid")
 
@@ -248,8 +263,7 @@ class CheckInService:
         current_data["status"] = "verified" if approved else "rejected"
         current_data["verified_plate"] = verified_plate
 
-        with open(status_file, "w") as f:
-            json.dump(current_data, f, indent=4)
+        await asyncio.to_thread(status_file.write_bytes, to_json(current_data, indent=4))
 
         return {"success": True, "status": status, "plate": verified_plate}
 
@@ -299,5 +313,7 @@ class CheckInService:
         pass
 
 
+@lru_cache(maxsize=1)
 def get_checkin_service():
+    """Get the shared CheckInService (it holds no per-request state)."""
     return CheckInService()
@@ -1,31 +1,140 @@
 
+import os
+import uuid
 import logging
 import asyncio
-import cv2
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict
 
+from pydantic_core import to_json
+
 from backend.model_process.control import orchestrator
+from backend.model_process.config import PLATE_FUNCTIONS
+from backend.model_process.utils.image_io import read_image, link_or_copy
+from backend.model_process.functions.plate import has_plate_candidate
+from backend.model_process.functions.volume import read_volume_inputs
+from backend.model_process.utils.background import get_background_for_camera, capture_background_if_empty
 from backend.data_process.history.logic import HistoryLogic
 from backend.data_process.register_car.logic import RegisteredCarLogic
-from backend.sync_process.sync.proxy import is_client_mode, upload_folder_to_master
+from backend.sync_process.sync.proxy import is_client_mode, upload_folder_to_master, get_master_url, get_master_client
 from backend.data_process.location.logic import LocationLogic
 from backend.config import DATA_ROOT
+from backend.settings import settings
+from backend.workflow.config import SIDE_VIEW_FUNCTIONS
+from backend.schemas import SyncPayload
 
 logger = logging.getLogger(__name__)
 
+# Detection result key -> (summary field, value field, default) extracted after each image
+RESULT_EXTRACTORS = {
+    "plate": ("plate_number", "plate", "Unknown"),
+    "color": ("primary_color", "primary_color", "Unknown"),
+    "wheel": ("wheel_count", "wheel_count_total", 0),
+}
+
+# all_results keys produced by the volume step (saved after the detection evidence)
+VOLUME_RESULT_KEYS = ("volume", "volume_error")
+
+# Directory listing cache (path -> (directory mtime_ns, file names)) for calibration lookups
+_dir_cache: Dict[str, tuple] = {}
+
+# Background Master sync: bounded queue drained by a few long-lived workers
+SYNC_QUEUE_SIZE = 100
+SYNC_WORKERS = 4
+SYNC_DRAIN_TIMEOUT = 30.0  # seconds shutdown waits for queued syncs
+
+
+def _listdir_cached(directory: Path) -> set:
+    """
+    Return file names in a directory.
+
+    The listing is cached and only re-scanned when the directory's mtime
+    changes (saving or deleting a calibration file updates it).
+    """
+    key = str(directory)
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except FileNotFoundError:
+        _dir_cache.pop(key, None)
+        return set()
+
+    entry = _dir_cache.get(key)
+    if entry is None or entry[0] != mtime:
+        with os.scandir(directory) as it:
+            names = {e.name for e in it if e.is_file()}
+        entry = _dir_cache[key] = (mtime, names)
+    return entry[1]
+
+
+def _resolve_calibration(side_cam_id: str, top_cam_id: str) -> tuple:
+    """Pick per-camera calibration files, falling back to the defaults.
+
+    Returns (side path, top path, whether both exist).
+    """
+    calib_dir = DATA_ROOT / "calibration"
+    calib_files = _listdir_cached(calib_dir)
+
+    calib_side_name = f"calib_side_{side_cam_id}.json"
+    if calib_side_name not in calib_files: calib_side_name = "calib_side.json"
+
+    calib_top_name = f"calib_top_{top_cam_id}.json"
+    if calib_top_name not in calib_files: calib_top_name = "calib_topdown.json"
+
+    calib_ready = calib_side_name in calib_files and calib_top_name in calib_files
+    return calib_dir / calib_side_name, calib_dir / calib_top_name, calib_ready
+
 
 class CheckOutService:
+    # Shared by all instances
+    _sync_q: Optional[asyncio.Queue] = None
+    _sync_workers: list = []
+
     def __init__(self):
         self.history_logic = HistoryLogic()
         self.registered_logic = RegisteredCarLogic()
         self.orchestrator = orchestrator
         self.location_logic = LocationLogic()
 
+    @classmethod
+    def _get_sync_queue(cls) -> asyncio.Queue:
+        """Create the sync queue and spawn its workers on first use (needs a running loop)."""
+        if cls._sync_q is None:
+            cls._sync_q = asyncio.Queue(maxsize=SYNC_QUEUE_SIZE)
+            cls._sync_workers = [asyncio.create_task(cls._sync_worker()) for _ in range(SYNC_WORKERS)]
+        return cls._sync_q
+
+    @classmethod
+    async def _sync_worker(cls):
+        """Drain queued folder syncs one at a time."""
+        while True:
+            folder_path, uuid_val = await cls._sync_q.get()
+            try:
+                await cls._sync_to_master(folder_path, uuid_val)
+            finally:
+                cls._sync_q.task_done()
+
+    @classmethod
+    async def shutdown(cls, timeout: float = SYNC_DRAIN_TIMEOUT):
+        """Let queued syncs finish (up to `timeout` seconds), then stop the workers (app shutdown)."""
+        if cls._sync_q is None:
+            return
+        try:
+            await asyncio.wait_for(cls._sync_q.join(), timeout)
+        except asyncio.TimeoutError:
+            while not cls._sync_q.empty():
+                _, uuid_val = cls._sync_q.get_nowait()
+                logger.warning(f"[CheckOut] Shutdown: dropping pending Master sync for {uuid_val}")
+        for worker in cls._sync_workers:
+            worker.cancel()
+        await asyncio.gather(*cls._sync_workers, return_exceptions=True)
+        cls._sync_workers = []
+        cls._sync_q = None
+
     async def process_checkout(
         self,
-        images: list, # List of dicts with 'path', 'cam_name', 'functions'
+        images: list, # List of dicts with 'path', 'cam_name', 'functions' (optional 'frame')
         location_id: str,
         date_str: Optional[str] = None
     ) -> Dict:
@@ -36,56 +145,105 @@ class CheckOutService:
         - Handle Volume if applicable.
         - Save evidence to history folder.
         """
-        import shutil
-        import json
-        
+        volume_prefetch = None
         try:
             # Resolve Location Name
             location_name = self.location_logic.get_location_name(location_id)
 
             # 1. Process ALL images with their functions
             all_results = {}
-            plate_number = "Unknown"
-            primary_color = "Unknown"
-            wheel_count = 0
-            
-            print(f"[Checkout] Processing {len(images)} images")
+            logger.debug(f"[Checkout] Processing {len(images)} images")
             
-            tasks = []
+            jobs = []        # (img_info, frame, functions) for images with AI functions
+            roles = {}       # "side"/"top" -> first matching img_info
+            save_names = []  # (src_path, evidence file name), in input order
             for img_info in images:
                 img_path = img_info["path"]
-                path_exists = img_path.exists() if hasattr(img_path, 'exists') else Path(str(img_path)).exists()
-                print(f"[Checkout] Reading image from: {img_path}, exists: {path_exists}")
-                frame = await asyncio.to_thread(cv2.imread, str(img_path))
+                funcs = img_info.get("functions", [])
+                if any(f in funcs for f in SIDE_VIEW_FUNCTIONS):
+                    roles.setdefault("side", img_info)
+                if "volume_top_down" in funcs:
+                    roles.setdefault("top", img_info)
+
+                cam_name = img_info.get("cam_name", "UnknownCam").replace(" ", "_")
+                ext = Path(str(img_path)).suffix or ".jpg"
+                save_names.append((img_path, f"{cam_name}_{'_'.join(funcs)}{ext}"))
+
+            # Decode each distinct path once, concurrently off the event loop;
+            # images that come with their in-memory "frame" skip the disk read
+            # str(path) -> decoded frame (None if unreadable), reused for background capture
+            frames_by_path = {
+                str(img_info["path"]): img_info["frame"]
+                for img_info in images
+                if img_info.get("frame") is not None
+            }
+            unique_paths = [
+                p for p in dict.fromkeys(str(img_info["path"]) for img_info in images)
+                if p not in frames_by_path
+            ]
+            decoded = await asyncio.gather(*(asyncio.to_thread(read_image, p) for p in unique_paths))
+            frames_by_path.update(zip(unique_paths, decoded))
+            for img_info in images:
+                img_path = img_info["path"]
+                funcs = img_info.get("functions", [])
+                frame = frames_by_path[str(img_path)]
                 if frame is not None:
-                    funcs = img_info.get("functions", [])
-                    print(f"[Checkout] Image loaded successfully, size: {frame.shape}, functions: {funcs}")
+                    logger.debug(f"[Checkout] Image loaded successfully, size: {frame.shape}, functions: {funcs}")
+                    # Normalised like the orchestrator does, so "Plate" / " alpr" count too
+                    if settings.plate_prefilter and any(f.lower().strip() in PLATE_FUNCTIONS for f in funcs):
+                        if not await asyncio.to_thread(has_plate_candidate, frame):
+                            logger.debug(f"[Checkout] No plate candidate in {img_path}, skipping plate OCR")
+                            funcs = [f for f in funcs if f.lower().strip() not in PLATE_FUNCTIONS]
                     if funcs:
-                        tasks.append((img_info, self.orchestrator.process_image(frame, funcs)))
+                        jobs.append((img_info, frame, funcs))
                 else:
-                    print(f"[Checkout] FAILED to read image: {img_path}")
+                    logger.warning(f"[Checkout] FAILED to read image: {img_path}")
             
-            # Run all detection tasks
-            print(f"[Checkout] Running {len(tasks)} detection tasks")
-            for img_info, task in tasks:
-                try:
-                    result = await task
-                    print(f"[Checkout] Task result keys: {list(result.keys()) if result else 'None'}")
-                    all_results.update(result)
-                    
-                    # Extract plate
-                    if "plate" in result and result["plate"].get("detected"):
-                        plate_number = result["plate"].get("plate", "Unknown")
-                    
-                    # Extract color
-                    if "color" in result and result["color"].get("detected"):
-                        primary_color = result["color"].get("primary_color", "Unknown")
-                        
-                    # Extract wheel count
-                    if "wheel" in result and result["wheel"].get("detected"):
-                        wheel_count = result["wheel"].get("wheel_count_total", 0)
-                except Exception as task_err:
-                    print(f"[Checkout] Task error: {task_err}")
+            # Prefetch volume inputs (images, calibration, background) while detection runs,
+            # only when volume estimation can actually run with them
+            side_img_info = roles.get("side")
+            top_img_info = roles.get("top")
+            if side_img_info and top_img_info:
+                side_cam_id = side_img_info.get("cam_id", "default")
+                top_cam_id = top_img_info.get("cam_id", "default")
+                calib_side, calib_top, calib_ready = _resolve_calibration(side_cam_id, top_cam_id)
+                bg_image = get_background_for_camera(top_cam_id)
+                if calib_ready and bg_image:
+                    volume_prefetch = asyncio.create_task(read_volume_inputs(
+                        side_img_info["path"], top_img_info["path"], calib_side, calib_top, bg_image
+                    ))
+
+            # Run detection for every image in one orchestrator pass; results keep input order
+            logger.debug(f"[Checkout] Running {len(jobs)} detection tasks")
+            results = await self.orchestrator.process_images(
+                [frame for _, frame, _ in jobs], [funcs for _, _, funcs in jobs]
+            )
+            top_result = {}
+            for (img_info, _, _), result in zip(jobs, results):
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"[Checkout] Task result keys: {list(result.keys()) if result else 'None'}")
+                all_results.update(result)
+                if img_info is roles.get("top"):
+                    top_result = result
+
+            # Extract plate / color / wheel count: one reduction per field, the last
+            # image with a positive detection wins
+            summary = {
+                field: next(
+                    (r[key].get(value_key, default) for r in reversed(results) if (r.get(key) or {}).get("detected")),
+                    default,
+                )
+                for key, (field, value_key, default) in RESULT_EXTRACTORS.items()
+            }
+
+            # Only the top frame is needed from here on (background capture); release the
+            # other multi-MB decoded frames now instead of holding them through volume/sync
+            top_frame = frames_by_path.get(str(top_img_info["path"])) if top_img_info else None
+            decoded = frames_by_path = jobs = frame = None
+            
+            plate_number = summary["plate_number"]
+            primary_color = summary["primary_color"]
+            wheel_count = summary["wheel_count"]
             
             # Normalize plate with error handling
             if plate_number and plate_number != "Unknown":
@@ -97,8 +255,11 @@ class CheckOutService:
             else:
                 clean_plate = "Unknown"
 
-            # 2. Find Open Session
-            target_record = self.history_logic.find_open_session(clean_plate)
+            # 2. Find Open Session (an unrecognized plate can never match one)
+            if clean_plate == "Unknown":
+                target_record = None
+            else:
+                target_record = self.history_logic.find_open_session(clean_plate)
             
             uuid_val = None
             folder_path = None
@@ -108,7 +269,6 @@ class CheckOutService:
                 status = "Đã ra"
             else:
                 # Create NEW record for unknown checkout
-                import uuid
                 uuid_val = str(uuid.uuid4())
                 folder_path = self.history_logic.create_car_folder(
                     uuid_val, 
@@ -130,42 +290,35 @@ class CheckOutService:
                 }
                 self.history_logic.add_record(record_data)
 
+            # Save detection outputs and images while volume estimation runs
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"[Checkout] Saving to folder: {folder_path}, exists: {folder_path.exists() if folder_path else 'N/A'}")
+            persist_task = None
+            if folder_path and folder_path.exists():
+                persist_task = asyncio.create_task(
+                    self._persist_evidence(folder_path, dict(all_results), save_names)
+                )
+            else:
+                logger.warning(f"[Checkout] Folder path invalid or doesn't exist: {folder_path}")
+
             # --- VOLUME DETECTION LOGIC ---
             volume_val = None
-            bg_image = None
-            
-            # Identify Side and Top images for volume
-            side_img_info = next((img for img in images if "volume_left_right" in img.get("functions", []) 
-                                  or "wheel_detect" in img.get("functions", []) 
-                                  or "color_detect" in img.get("functions", [])), None)
             
-            top_img_info = next((img for img in images if "volume_top_down" in img.get("functions", [])), None)
-            
-            print(f"[Checkout] Volume Check: Side={bool(side_img_info)}, Top={bool(top_img_info)}, Path={folder_path}")
+            logger.debug(f"[Checkout] Volume Check: Side={bool(side_img_info)}, Top={bool(top_img_info)}, Path={folder_path}")
 
             if side_img_info and top_img_info and folder_path:
-                side_cam_id = side_img_info.get("cam_id", "default")
-                top_cam_id = top_img_info.get("cam_id", "default")
-                
-                # Resolve Calibration Paths
-                calib_dir = DATA_ROOT / "calibration"
-                
-                calib_side = calib_dir / f"calib_side_{side_cam_id}.json"
-                if not calib_side.exists(): calib_side = calib_dir / "calib_side.json"
-                    
-                calib_top = calib_dir / f"calib_top_{top_cam_id}.json"
-                if not calib_top.exists(): calib_top = calib_dir / "calib_topdown.json"
-                
-                # Get background from shared backgrounds folder
-                from backend.model_process.utils.background import get_background_for_camera, capture_background_if_empty
-                
-                bg_image = get_background_for_camera(top_cam_id)
-                
-                if not bg_image:
+                # Calibration paths and background were resolved before detection
+                if not bg_image and top_result.get("truck", {}).get("detected"):
+                    # Truck already detected in the top image - it can't serve as a background
+                    logger.info(f"[Checkout] No background found and truck present in top image, skipping capture")
+                elif not bg_image:
                     # Try to capture background if no car detected in top image
                     logger.info(f"[Checkout] No background found, checking if we can capture one...")
                     try:
-                        top_img_cv = await asyncio.to_thread(cv2.imread, str(top_img_info["path"]))
+                        # Already decoded above; only re-read if that decode failed
+                        top_img_cv = top_frame
+                        if top_img_cv is None:
+                            top_img_cv = await asyncio.to_thread(read_image, str(top_img_info["path"]))
                         if top_img_cv is not None:
                             await capture_background_if_empty(top_cam_id, top_img_cv)
                             bg_image = get_background_for_camera(top_cam_id)
@@ -177,7 +330,7 @@ class CheckOutService:
                 else:
                     logger.warning(f"[Checkout] Skipped Volume: No background image found.")
 
-                if calib_side.exists() and calib_top.exists() and bg_image:
+                if calib_ready and bg_image:
                      logger.info(f"[Checkout] Starting volume estimation for session {uuid_val}...")
                      try:
                          # Ensure paths are absolute or correct relative paths
@@ -186,7 +339,9 @@ class CheckOutService:
                              top_fg_image_path=Path(top_img_info["path"]),
                              top_bg_image_path=bg_image,
                              side_calib_path=calib_side,
-                             top_calib_path=calib_top
+                             top_calib_path=calib_top,
+                             # No prefetch when the background was only captured just now
+                             preloaded=await volume_prefetch if volume_prefetch else None
                          )
                          if vol_res and vol_res.get("success"):
                              volume_val = vol_res.get("volume")
@@ -196,14 +351,10 @@ class CheckOutService:
                              # Save error to JSON for visibility
                              err = vol_res.get('error') if vol_res else 'Unknown'
                              logger.error(f"[Checkout] Volume failed: {err}")
-                             if folder_path and folder_path.exists():
-                                 with open(folder_path / "checkout_model_volume_error.json", "w", encoding="utf-8") as f:
-                                     json.dump({"error": err, "details": vol_res}, f, indent=4)
+                             all_results["volume_error"] = {"error": err, "details": vol_res}
                      except Exception as ve:
                          logger.error(f"[Checkout] Volume exception: {ve}", exc_info=True)
-                         if folder_path and folder_path.exists():
-                             with open(folder_path / "checkout_model_volume_error.json", "w", encoding="utf-8") as f:
-                                 json.dump({"error": str(ve)}, f, indent=4)
+                         all_results["volume_error"] = {"error": str(ve)}
             else:
                  msg = []
                  if not side_img_info: msg.append("Missing Side Cam")
@@ -211,37 +362,14 @@ class CheckOutService:
                  if not folder_path: msg.append("Missing Folder Path")
                  
                  logger.warning(f"[Checkout] Volume Skipped: {', '.join(msg)}")
-                 if folder_path:
-                     with open(folder_path / "checkout_model_volume_error.json", "w", encoding="utf-8") as f:
-                         json.dump({"error": "Volume Skipped", "reasons": msg}, f, indent=4)
-
-            # 3. Save results to folder
-            print(f"[Checkout] Saving to folder: {folder_path}, exists: {folder_path.exists() if folder_path else 'N/A'}")
-            print(f"[Checkout] all_results keys: {list(all_results.keys())}")
-            print(f"[Checkout] images count: {len(images)}")
-            
-            if folder_path and folder_path.exists():
-                # Save model outputs
-                for func_name, res in all_results.items():
-                    if func_name != "raw":
-                        output_path = folder_path / f"checkout_model_{func_name}.json"
-                        print(f"[Checkout] Saving model output to: {output_path}")
-                        with open(output_path, "w", encoding="utf-8") as f:
-                            json.dump(res, f, indent=4)
-                
-                # Save images - use unified naming: {cam_name}_{functions}.jpg
-                for img_info in images:
-                    path = img_info["path"]
-                    cam_name = img_info.get("cam_name", "UnknownCam").replace(" ", "_")
-                    funcs_str = "_".join(img_info.get("functions", []))
-                    ext = Path(str(path)).suffix or ".jpg"
-                    new_name = f"{cam_name}_{funcs_str}{ext}"
-                    src_exists = Path(str(path)).exists()
-                    print(f"[Checkout] Copying image {path} -> {folder_path / new_name}, src exists: {src_exists}")
-                    if src_exists:
-                        shutil.copy2(str(path), folder_path / new_name)
-            else:
-                print(f"[Checkout] Folder path invalid or doesn't exist: {folder_path}")
+                 all_results["volume_error"] = {"error": "Volume Skipped", "reasons": msg}
+
+            # 3. Finish saving results to folder: volume outputs now, detection evidence
+            # was already started before volume estimation
+            logger.debug(f"[Checkout] all_results keys: {list(all_results.keys())}")
+            if persist_task:
+                volume_results = {k: all_results[k] for k in VOLUME_RESULT_KEYS if k in all_results}
+                await asyncio.gather(persist_task, self._persist_evidence(folder_path, volume_results, []))
 
 
             # 4. Update History Record
@@ -259,51 +387,24 @@ class CheckOutService:
                 try:
                     update_data["vol_measured"] = str(round(float(final_volume), 2))
                 except (ValueError, TypeError) as e:
-                    print(f"[Checkout] Invalid volume value: {final_volume}, error: {e}")
+                    logger.warning(f"[Checkout] Invalid volume value: {final_volume}, error: {e}")
             
             if uuid_val:
                 try:
-                    print(f"[Checkout] Updating record {uuid_val} with: {update_data}")
+                    logger.debug(f"[Checkout] Updating record {uuid_val} with: {update_data}")
                     self.history_logic.update_record(uuid_val, update_data)
-                    print(f"[Checkout] Record updated successfully")
+                    logger.debug(f"[Checkout] Record updated successfully")
                 except Exception as e:
-                    print(f"[Checkout] Failed to update history record: {e}")
-            
+                    logger.error(f"[Checkout] Failed to update history record: {e}")
+
             # --- SYNC FOLDER TO MASTER (if in Client mode) ---
+            # Queued for the background workers so the response doesn't wait on the upload;
+            # enqueued after the record update so the Master receives the persisted record
             if is_client_mode() and folder_path:
                 try:
-                    logger.info(f"[CheckOut] Syncing folder to Master: {folder_path}")
-                    sync_result = await upload_folder_to_master(Path(folder_path) if isinstance(folder_path, str) else folder_path)
-                    if sync_result and sync_result.get("success"):
-                        master_folder_path = sync_result.get("folder_path")
-                        logger.info(f"[CheckOut] Folder synced to Master: {master_folder_path}")
-                        
-                        # Update the synced record's folder_path on Master
-                        from backend.sync_process.sync.proxy import get_master_url
-                        from backend.schemas import SyncPayload
-                        import httpx
-                        
-                        master_url = get_master_url()
-                        if master_url:
-                            payload = SyncPayload(
-                                type="history",
-                                action="update_folder_path",
-                                data={
-                                    "id": uuid_val,
-                                    "folder_path": master_folder_path
-                                },
-                                timestamp=datetime.now().isoformat()
-                            )
-                            async with httpx.AsyncClient(timeout=5.0) as client:
-                                await client.post(
-                                    f"{master_url.rstrip('/')}/api/sync/receive",
-                                    json=payload.model_dump(),
-                                    headers={"Content-Type": "application/json"}
-                                )
-                    else:
-                        logger.warning("[CheckOut] Failed to sync folder to Master")
-                except Exception as e:
-                    logger.error(f"[CheckOut] File sync error: {e}")
+                    self._get_sync_queue().put_nowait((folder_path, uuid_val))
+                except asyncio.QueueFull:
+                    logger.warning(f"[CheckOut] Sync queue full, skipping Master sync for {uuid_val}")
             
             # Get history volume (vol_measured from entry)
             history_vol = None
@@ -323,19 +424,83 @@ class CheckOutService:
                 "volume": float(final_volume) if final_volume is not None else None,
                 "is_checkout": True
             }
-            print(f"[Checkout] Returning result: {result}")
+            logger.debug(f"[Checkout] Returning result: {result}")
             return result
 
             
         except Exception as e:
-            print(f"[Checkout] Checkout error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"[Checkout] Checkout error: {e}", exc_info=True)
             return {"success": False, "error": str(e)}
+        finally:
+            # Volume skipped (no folder) or an error: drop the unused read
+            if volume_prefetch is not None and not volume_prefetch.done():
+                volume_prefetch.cancel()
+
+    @staticmethod
+    async def _persist_evidence(folder_path: Path, results: Dict, save_names: list):
+        """
+        Write model outputs as checkout_model_{name}.json and copy evidence images.
+
+        Everything is serialized first with pydantic-core's native encoder, then
+        written concurrently off the event loop.
+        """
+        json_writes = []
+        for func_name, res in results.items():
+            if func_name != "raw":
+                output_path = folder_path / f"checkout_model_{func_name}.json"
+                logger.debug(f"[Checkout] Saving model output to: {output_path}")
+                json_writes.append((output_path, to_json(res, indent=4)))
+
+        # Save images - use unified naming: {cam_name}_{functions}.jpg
+        copy_ops = []
+        for path, new_name in dict.fromkeys(save_names):
+            src_exists = Path(str(path)).exists()
+            logger.debug(f"[Checkout] Copying image {path} -> {folder_path / new_name}, src exists: {src_exists}")
+            if src_exists:
+                copy_ops.append((str(path), folder_path / new_name))
+
+        await asyncio.gather(
+            *(asyncio.to_thread(out.write_bytes, data) for out, data in json_writes),
+            *(asyncio.to_thread(link_or_copy, src, dst) for src, dst in copy_ops),
+        )
+
+    @classmethod
+    async def _sync_to_master(cls, folder_path: Path, uuid_val: str):
+        """Upload the evidence folder to Master and point the Master record at it."""
+        try:
+            logger.info(f"[CheckOut] Syncing folder to Master: {folder_path}")
+            sync_result = await upload_folder_to_master(Path(folder_path) if isinstance(folder_path, str) else folder_path)
+            if sync_result and sync_result.get("success"):
+                master_folder_path = sync_result.get("folder_path")
+                logger.info(f"[CheckOut] Folder synced to Master: {master_folder_path}")
+                
+                # Update the synced record's folder_path on Master
+                master_url = get_master_url()
+                if master_url:
+                    payload = SyncPayload(
+                        type="history",
+                        action="update_folder_path",
+                        data={
+                            "id": uuid_val,
+                            "folder_path": master_folder_path
+                        },
+                        timestamp=datetime.now().isoformat()
+                    )
+                    await get_master_client().post(
+                        f"{master_url.rstrip('/')}/api/sync/receive",
+                        content=payload.model_dump_json(),
+                        headers={"Content-Type": "application/json"}
+                    )
+            else:
+                logger.warning("[CheckOut] Failed to sync folder to Master")
+        except Exception as e:
+            logger.error(f"[CheckOut] File sync error: {e}")
 
     async def close(self):
         pass
 
+@lru_cache(maxsize=1)
 def get_checkout_service():
+    """Get the shared CheckOutService (it holds no per-request state)."""
     return CheckOutService()
 
@@ -11,6 +11,9 @@ class LocationTag(str, Enum):
     PARKING = "Gửi xe"
     CORE = "Cơ bản"
 
+# Camera functions that mark an image as the side view for volume estimation
+SIDE_VIEW_FUNCTIONS = ("volume_left_right", "wheel_detect", "color_detect")
+
 class DetectionStrategy(BaseModel):
     tag: LocationTag
     description: str
@@ -41,50 +44,46 @@ LOCATION_STRATEGIES = {
     ),
 }
 
+# Tag lookup by value or name, built once at import
+_TAG_BY_KEY = {t.value: t for t in LocationTag} | {t.name: t for t in LocationTag}
+
 def get_location_strategy(tag: str) -> Optional[DetectionStrategy]:
     try:
         # Match by value or name
-        for t in LocationTag:
-            if t.value == tag or t.name == tag:
-                return LOCATION_STRATEGIES.get(t)
-        # Default or search loosely
-        return None
+        t = _TAG_BY_KEY.get(tag)
+        return LOCATION_STRATEGIES.get(t) if t else None
     except:
         return None
 
 def group_cameras_by_tag(cameras, locations):
     """
     Group cameras by location tags.
+
+    Returns {tag value: {"tag", "description", "locations": [{"id", "name", "cameras": [...]}]}}
+    with every tag present, built in one pass over the cameras.
     """
     grouped = {}
     for tag in LocationTag:
+        strategy = LOCATION_STRATEGIES.get(tag)
         grouped[tag.value] = {
             "tag": tag.value,
-            "description": LOCATION_STRATEGIES[tag].description,
+            "description": strategy.description if strategy else tag.value,
             "locations": []
         }
     
     # Map locations to tags (assume Location has .tag)
     loc_map = {loc.id: loc for loc in locations}
+    loc_entries = {}  # location id -> its entry under grouped[tag]["locations"]
     
-    # Group by tag
     for cam in cameras:
-        # Cam has location_id or location name?
-        # Logic in data_process/__init__.py for legacy camera used dict.
-        # Assuming 'cameras' is list of Schema objects (Camera).
-        loc_id = getattr(cam, 'location_id', '')
-        if not loc_id: continue
+        loc = loc_map.get(getattr(cam, 'location_id', '') or None)
+        if not loc or loc.tag not in grouped:
+            continue
         
-        loc = loc_map.get(loc_id)
-        if loc and loc.tag in grouped:
-            # Check if location already added
-            target = grouped[loc.tag]["locations"]
-            # Add cam to location entry... logic complex? 
-            # Or just return structure consumers expect.
-            # Assuming simplified grouping for now.
-            pass
+        entry = loc_entries.get(loc.id)
+        if entry is None:
+            entry = loc_entries[loc.id] = {"id": loc.id, "name": loc.name, "cameras": []}
+            grouped[loc.tag]["locations"].append(entry)
+        entry["cameras"].append({"cam_id": cam.id, "name": cam.name})
             
-    return grouped # Placeholder implementation as I don't recall exact output structure needed by frontend.
-    # Frontend likely expects a list of tags with cameras nested.
-    # Given I don't have the frontend code right here, I'll provide a safe dict.
-
+    return grouped
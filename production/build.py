@@ -8,16 +8,22 @@ Usage:
   uv run python production/build.py --frontend   # Frontend only
   uv run python production/build.py --backend    # Backend only
   uv run python production/build.py --clean      # Manual cleanup only
+  uv run python production/build.py --upx        # Also compress DLLs with UPX (needs upx on PATH)
 """
 
 import os
 import sys
 import shutil
+import hashlib
+import importlib.metadata
+import importlib.util
 import subprocess
 import time
 import re
+import threading
+import uuid
 import tomllib
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from tqdm import tqdm
@@ -34,12 +40,14 @@ OUTPUT_DIR = PROD_DIR / "output"
 ASSETS_DIR = PROD_DIR / "assets"
 ISS_CONFIG = PROD_DIR / "config" / "installer.iss"
 FRONTEND_DIR = ROOT_DIR / "frontend"
+CACHE_DIR = PROD_DIR / ".build_cache"  # Input digests; survives full cleans
 
 # CLI Arguments
 INCREMENTAL = "--incremental" in sys.argv or "-i" in sys.argv
 FRONTEND_ONLY = "--frontend" in sys.argv
 BACKEND_ONLY = "--backend" in sys.argv
 CLEAN_ONLY = "--clean" in sys.argv
+USE_UPX = "--upx" in sys.argv
 
 # CPU Configuration
 CPU_CORES = os.cpu_count() or 8
@@ -62,27 +70,71 @@ PACKAGE_NAME_MAP = {
 }
 
 # Packages that need full inclusion (dynamic imports)
-INCLUDE_FULL_PACKAGES = {
+INCLUDE_FULL_PACKAGES = frozenset({
     "pandas", "matplotlib", "openpyxl", "passlib",
     "bcrypt", "PIL", "jose", "apscheduler",
-}
+})
 
 # Packages to skip in Nuitka
-SKIP_PACKAGES = {"uvicorn"}
+SKIP_PACKAGES = frozenset({"uvicorn"})
+
+# Modules never followed by Nuitka: not used at runtime, or test/dev-only
+# subtrees of packages that are included in full (a tuple keeps argv order stable)
+NOFOLLOW_IMPORTS = (
+    # Heavy ML stacks (ONNX Runtime is used instead)
+    "torch", "torchvision", "ultralytics", "scipy", "numba",
+    # Alternative GUI toolkits (the app uses PySide6)
+    "tkinter", "PyQt5", "PyQt6", "PySide2",
+    # Docs / notebooks / test tooling
+    "docutils", "sphinx", "notebook", "jupyter",
+    "*.tests",
+    "numpy.f2py",
+    "matplotlib.sphinxext",
+    "matplotlib.sample_data",
+    "matplotlib.backends.qt_editor",
+    "matplotlib.backends.backend_tk*",
+    "matplotlib.backends._backend_tk",
+    "matplotlib.backends.backend_wx*",
+    "matplotlib.backends.backend_gtk*",
+    "matplotlib.backends.backend_webagg*",
+    "matplotlib.backends.backend_nbagg",
+    "matplotlib.backends.backend_macosx",
+)
+
+# pyproject dependency names and installer.iss defines
+DEP_NAME_RE = re.compile(r"^([a-zA-Z0-9_-]+)")
+ISS_DEFINE_RE = re.compile(r'#define (AppVersion|AppPublisher) "[^"]+"')
+
+# Nuitka progress parsing (bytes patterns: the pipe is read in binary mode)
+MODULE_PROGRESS_RE = re.compile(rb"\((\d+)/(\d+)\)")        # (123/456)
+C_PROGRESS_RE = re.compile(rb"\[\s*(\d+)%\]")               # [ 10%]
+ANSI_RE = re.compile(rb'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+# Inputs hashed to decide whether a step can be skipped
+FRONTEND_IGNORE = {"out", "node_modules", ".next"}
+BACKEND_INPUTS = ("backend", "app.py", "pyproject.toml", "uv.lock")
+BACKEND_IGNORE = {"__pycache__", ".pytest_cache", "database"}
 
 # =============================================================================
 # PYPROJECT CONFIG
 # =============================================================================
 
 
-@lru_cache(maxsize=1)
+_pyproject_cache: tuple[int, dict] | None = None
+
+
 def get_pyproject_config() -> dict:
-    """Read and cache pyproject.toml configuration (cached for performance)."""
+    """Read pyproject.toml, re-parsing only when its mtime changes."""
+    global _pyproject_cache
     pyproject_path = ROOT_DIR / "pyproject.toml"
-    if not pyproject_path.exists():
-        raise FileNotFoundError(f"pyproject.toml not found at {pyproject_path}")
-    with open(pyproject_path, "rb") as f:
-        return tomllib.load(f)
+    try:
+        mtime = pyproject_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"pyproject.toml not found at {pyproject_path}") from None
+    if _pyproject_cache is None or _pyproject_cache[0] != mtime:
+        with open(pyproject_path, "rb") as f:
+            _pyproject_cache = (mtime, tomllib.load(f))
+    return _pyproject_cache[1]
 
 
 def get_app_version() -> str:
@@ -107,41 +159,16 @@ def get_production_packages() -> list[str]:
     
     packages = []
     for dep in dependencies:
-        if match := re.match(r"^([a-zA-Z0-9_-]+)", dep):
+        if match := DEP_NAME_RE.match(dep):
             pip_name = match.group(1).lower()
             if pip_name not in SKIP_PACKAGES:
-                packages.append(PACKAGE_NAME_MAP.get(pip_name, pip_name.replace("-", "_")))
+                mapped = PACKAGE_NAME_MAP.get(pip_name)
+                if mapped is None:
+                    mapped = pip_name.replace("-", "_")
+                packages.append(mapped)
     return packages
 
 
-def sync_installer_config():
-    """
-    Synchronize installer.iss with version/author from pyproject.toml.
-    This ensures the installer always matches the codebase version.
-    """
-    version = get_app_version()
-    author = get_app_author()
-    
-    log(f"Syncing installer config: v{version} by {author}", "info")
-    
-    iss_content = ISS_CONFIG.read_text(encoding="utf-8")
-    
-    # Update #define directives at the top
-    iss_content = re.sub(
-        r'#define AppVersion "[^"]+"',
-        f'#define AppVersion "{version}"',
-        iss_content
-    )
-    iss_content = re.sub(
-        r'#define AppPublisher "[^"]+"',
-        f'#define AppPublisher "{author}"',
-        iss_content
-    )
-    
-    ISS_CONFIG.write_text(iss_content, encoding="utf-8")
-    log(f"Installer synced: v{version}, author: {author}", "success")
-
-
 def preflight_checks() -> bool:
     """
     Validate all requirements BEFORE starting the long build process.
@@ -168,16 +195,18 @@ def preflight_checks() -> bool:
         if not (ASSETS_DIR / img).exists():
             warnings.append(f"Missing installer image: {img} (installer will use defaults)")
     
-    # Check Nuitka is available
-    try:
-        result = subprocess.run(
-            [sys.executable, "-m", "nuitka", "--version"],
-            capture_output=True, text=True, timeout=10
-        )
-        if result.returncode != 0:
-            errors.append("Nuitka not working. Run: uv add nuitka")
-    except Exception as e:
-        errors.append(f"Nuitka check failed: {e}")
+    # A package both included in full and excluded from following is a config slip
+    if conflicts := INCLUDE_FULL_PACKAGES.intersection(NOFOLLOW_IMPORTS):
+        warnings.append(f"Included and excluded at once: {', '.join(sorted(conflicts))}")
+    
+    # Check Nuitka is installed (metadata lookup only - no interpreter spawn)
+    if importlib.util.find_spec("nuitka") is None:
+        errors.append("Nuitka not installed. Run: uv add nuitka")
+    else:
+        try:
+            log(f"Nuitka {importlib.metadata.version('nuitka')}", "dim")
+        except importlib.metadata.PackageNotFoundError:
+            errors.append("Nuitka install is broken. Run: uv sync")
     
     # Check frontend build or node_modules
     frontend_out = FRONTEND_DIR / "out"
@@ -228,20 +257,128 @@ def header(title: str):
     print(f"\n{'=' * 60}\n  {title}\n{'=' * 60}\n")
 
 
-def run_cmd(cmd, cwd=None, check=True, silent=False):
-    """Run a shell command with optional logging."""
+def link_or_copy(src: Path, dst: Path):
+    """Hardlink src to dst (no data copied on the same volume), else copy the
+    contents only. Replaces dst rather than writing through it (same as the
+    backend's image_io.link_or_copy)."""
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def remove_path(path: Path):
+    """Delete a file or directory tree if it exists."""
+    if path.is_dir():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def discard_tree(path: Path):
+    """
+    Move a directory aside (a constant-time rename) and delete it on a
+    background thread so the build can carry on. Falls back to an in-place
+    delete when the rename is refused, e.g. while a file inside is locked.
+    """
+    if not path.is_dir():
+        remove_path(path)
+        return
+    scratch = PROD_DIR / f".trash-{uuid.uuid4().hex[:8]}"
+    try:
+        path.rename(scratch)
+    except OSError:
+        remove_path(path)
+        return
+    # Non-daemon: the interpreter waits for the delete to finish before exiting
+    threading.Thread(
+        target=shutil.rmtree, args=(scratch,), kwargs={"ignore_errors": True},
+        name="DiscardThread",
+    ).start()
+
+
+def run_cmd(cmd: list, cwd=None, check=True, silent=False):
+    """Run a command directly (no shell) with optional logging."""
     if not silent:
-        cmd_str = ' '.join(str(c) for c in cmd) if isinstance(cmd, list) else str(cmd)
+        cmd_str = ' '.join(str(c) for c in cmd)
         log(f"Running: {cmd_str[:60]}...", "dim")
-    result = subprocess.run(cmd, cwd=str(cwd) if cwd else None, shell=True)
+    # Resolve launchers like npm -> npm.cmd via PATHEXT, which CreateProcess won't do
+    exe = shutil.which(str(cmd[0])) or str(cmd[0])
+    result = subprocess.run([exe, *map(str, cmd[1:])], cwd=str(cwd) if cwd else None)
     if check and result.returncode != 0:
         raise RuntimeError(f"Command failed (exit {result.returncode})")
     return result
 
 
+# =============================================================================
+# BUILD CACHE
+# =============================================================================
+
+
+def _dir_hash(path: Path, ignore: set[str] = frozenset(), digest=None) -> str:
+    """
+    Fingerprint a file or directory tree from (relpath, size, mtime_ns).
+    Only stat() is used, so hashing the whole frontend takes milliseconds.
+    """
+    h = digest or hashlib.blake2b(digest_size=16)
+    if path.is_file():
+        st = path.stat()
+        h.update(f"{path.name}|{st.st_size}|{st.st_mtime_ns}\n".encode())
+        return h.hexdigest()
+
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        for entry in entries:
+            if entry.name in ignore:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(Path(entry.path))
+            else:
+                st = entry.stat(follow_symlinks=False)
+                rel = os.path.relpath(entry.path, path)
+                h.update(f"{rel}|{st.st_size}|{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+def frontend_hash() -> str:
+    """Digest of the Next.js sources (build outputs and caches excluded)."""
+    return _dir_hash(FRONTEND_DIR, FRONTEND_IGNORE)
+
+
+def backend_hash() -> str:
+    """Digest of everything Nuitka compiles or bundles."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"upx={USE_UPX}\n".encode())
+    inputs = [ROOT_DIR / name for name in BACKEND_INPUTS]
+    inputs += [FRONTEND_DIR / "out", ASSETS_DIR]
+    for path in inputs:
+        if path.exists():
+            h.update(f"#{path.name}\n".encode())
+            _dir_hash(path, BACKEND_IGNORE, h)
+    return h.hexdigest()
+
+
+def read_stamp(step: str) -> str | None:
+    """Return the digest recorded after the last successful run of a step."""
+    try:
+        return (CACHE_DIR / f"{step}.hash").read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+
+def write_stamp(step: str, digest: str):
+    """Record the input digest of a step that just succeeded."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    (CACHE_DIR / f"{step}.hash").write_text(digest, encoding="utf-8")
+
+
 # =============================================================================
 # BUILD SYNC FUNCTIONS
-# =============================================================================}
+# =============================================================================
 
 
 def sync_installer_config():
@@ -249,10 +386,12 @@ def sync_installer_config():
     version, author = get_app_version(), get_app_author()
     log(f"Syncing installer: v{version} by {author}", "info")
     
-    content = ISS_CONFIG.read_text(encoding="utf-8")
-    content = re.sub(r'#define AppVersion "[^"]+"', f'#define AppVersion "{version}"', content)
-    content = re.sub(r'#define AppPublisher "[^"]+"', f'#define AppPublisher "{author}"', content)
-    ISS_CONFIG.write_text(content, encoding="utf-8")
+    original = ISS_CONFIG.read_bytes().decode("utf-8")
+    values = {"AppVersion": version, "AppPublisher": author}
+    content = ISS_DEFINE_RE.sub(lambda m: f'#define {m[1]} "{values[m[1]]}"', original)
+    # Only rewrite on change so the file's mtime (and git status) stay untouched
+    if content != original:
+        ISS_CONFIG.write_bytes(content.encode("utf-8"))
     
     log(f"Installer synced: v{version}, author: {author}", "success")
 
@@ -275,26 +414,26 @@ def clean(incremental: bool = False, create_dirs: bool = True):
         ROOT_DIR / "CamMana_Setup.exe", 
         PROD_DIR / "dist",
         BUILD_DIR,
-        OUTPUT_DIR
+        OUTPUT_DIR,
+        *PROD_DIR.glob(".trash-*"),  # leftovers of an interrupted run
     ]
     
-    for f in targets:
-        if f.exists():
-            if f.is_dir():
-                shutil.rmtree(f, ignore_errors=True)
-            else:
-                f.unlink(missing_ok=True)
+    # Python sources only live in backend/ plus the two top-level scripts, so
+    # don't walk node_modules or the (possibly being discarded) build trees.
+    # Targets and pycache dirs are disjoint trees, so delete them concurrently.
+    pycache_dirs = [
+        *(ROOT_DIR / "backend").rglob("__pycache__"),
+        *(p for p in (ROOT_DIR / "__pycache__", PROD_DIR / "__pycache__") if p.exists()),
+    ]
+    with ThreadPoolExecutor(max_workers=min(8, CPU_CORES)) as pool:
+        list(pool.map(discard_tree, targets))
+        list(pool.map(remove_path, pycache_dirs))
 
     if create_dirs:
         OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
         BUILD_DIR.mkdir(parents=True, exist_ok=True)
     
-    # Clean pycache
-    count = 0
-    for p in ROOT_DIR.rglob("__pycache__"):
-        shutil.rmtree(p, ignore_errors=True)
-        count += 1
-    
+    count = len(pycache_dirs)
     log(f"Pre-flight cleanup done ({count} pycache dirs removed)", "success")
 
 
@@ -302,25 +441,40 @@ def build_frontend(force: bool = False):
     """Build React frontend"""
     log("Building React Frontend...", "step")
     out_dir = FRONTEND_DIR / "out"
+    digest = frontend_hash()
     
-    if not force and out_dir.exists() and (out_dir / "index.html").exists():
-        log("Frontend already built (use --frontend to rebuild)", "info")
+    if not force and (out_dir / "index.html").exists() and read_stamp("frontend") == digest:
+        log("Frontend sources unchanged - reusing build (use --frontend to rebuild)", "info")
         return
     
-    if out_dir.exists():
-        shutil.rmtree(out_dir)
+    discard_tree(out_dir)
     
-    if not (FRONTEND_DIR / "node_modules").exists():
+    # Reinstall dependencies only when the lockfile changed; .next/cache is
+    # never cleaned so Next.js can reuse its persistent build cache.
+    lockfile = FRONTEND_DIR / "package-lock.json"
+    lock_digest = _dir_hash(lockfile) if lockfile.exists() else None
+    if not (FRONTEND_DIR / "node_modules").exists() or read_stamp("npm") != lock_digest:
         log("Installing npm dependencies...", "info")
-        run_cmd(["npm", "install"], cwd=FRONTEND_DIR, silent=True)
+        install = ["npm", "ci"] if lock_digest else ["npm", "install"]
+        run_cmd(install + ["--no-audit", "--no-fund"], cwd=FRONTEND_DIR, silent=True)
+        if lock_digest:
+            write_stamp("npm", lock_digest)
     
+    os.environ.setdefault("NEXT_TELEMETRY_DISABLED", "1")
     run_cmd(["npm", "run", "build"], cwd=FRONTEND_DIR, silent=True)
+    write_stamp("frontend", digest)
     log("Frontend build complete", "success")
 
 
 def compile_nuitka():
     """Compile Python to standalone using Nuitka"""
     log("Compiling with Nuitka...", "step")
+    
+    digest = backend_hash()
+    if INCREMENTAL and (PROD_DIR / "dist" / "CamMana.exe").exists() and read_stamp("nuitka") == digest:
+        log("Backend inputs unchanged - reusing existing dist", "info")
+        return
+    
     log(f"Using {NUITKA_JOBS} parallel workers (detected {CPU_CORES} CPU cores)", "info")
     
     # Auto-detect packages from pyproject.toml
@@ -344,6 +498,14 @@ def compile_nuitka():
         "--plugin-enable=pyside6",
     ]
     
+    # Optional UPX compression of the bundled binaries (smaller dist/installer)
+    if USE_UPX:
+        if upx := shutil.which("upx"):
+            nuitka_cmd += ["--plugin-enable=upx", f"--upx-binary={upx}"]
+            log("UPX compression enabled", "info")
+        else:
+            log("--upx given but upx not found on PATH - skipping compression", "warning")
+    
     # Add dynamic package includes (packages with complex submodule structures)
     for pkg in packages_to_include:
         nuitka_cmd.append(f"--include-package={pkg}")
@@ -366,24 +528,8 @@ def compile_nuitka():
         "--noinclude-unittest-mode=nofollow",
         "--noinclude-IPython-mode=nofollow",
         
-        # Block heavy libraries from being followed recursively (they take ages)
-        "--nofollow-import-to=torch",
-        "--nofollow-import-to=torchvision",
-        "--nofollow-import-to=ultralytics",
-        "--nofollow-import-to=tkinter",
-        "--nofollow-import-to=scipy",
-        "--nofollow-import-to=numba",
-        "--nofollow-import-to=docutils",
-        "--nofollow-import-to=notebook",
-        "--nofollow-import-to=jupyter",
-        "--nofollow-import-to=pandas.tests",
-        "--nofollow-import-to=numpy.tests",
-        "--nofollow-import-to=numpy.f2py",
-        "--nofollow-import-to=matplotlib.tests",
-        "--nofollow-import-to=matplotlib.sphinxext",
-        "--nofollow-import-to=matplotlib.backends.test_backends",
-        "--nofollow-import-to=matplotlib.sample_data",
-        "--nofollow-import-to=matplotlib.backends.qt_editor",
+        # Block heavy/unused libraries from being followed recursively (they take ages)
+        *(f"--nofollow-import-to={mod}" for mod in NOFOLLOW_IMPORTS),
         
         # Entry
         str(ROOT_DIR / "app.py")
@@ -399,15 +545,24 @@ def compile_nuitka():
     env = os.environ.copy()
     env["NO_COLOR"] = "1"
     env["PYTHONIOENCODING"] = "utf-8"
+    # Keep compile caches per checkout so concurrent builds of different
+    # trees don't share (and clobber) them; downloads stay in the user cache.
+    for kind in ("CCACHE", "CLCACHE", "BYTECODE", "DLL_DEPENDENCIES"):
+        env.setdefault(f"NUITKA_CACHE_DIR_{kind}", str(CACHE_DIR / "nuitka" / kind.lower()))
+    # Point Nuitka at ccache explicitly so Phase 3 reuses objects across builds
+    if ccache := shutil.which("ccache"):
+        env.setdefault("NUITKA_CCACHE_BINARY", ccache)
+        log(f"C compiler cache: {env['NUITKA_CCACHE_BINARY']}", "dim")
+    else:
+        log("ccache not found - Phase 3 recompiles all C code", "dim")
     
     process = subprocess.Popen(
         nuitka_cmd, 
         stdout=subprocess.PIPE, 
         stderr=subprocess.STDOUT,
-        text=True, 
         shell=False,
         env=env,
-        bufsize=1
+        bufsize=131072
     )
     
     pbar = tqdm(total=100, desc="Building", unit="%", bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}{postfix}]')
@@ -415,58 +570,56 @@ def compile_nuitka():
     errors = []
     modules_total = 0
     modules_done = 0
+    c_pct = -1
     
-    # regex for module progress: (123/456)
-    module_regex = re.compile(r"\((\d+)/(\d+)\)")
-    # regex for C compilation progress: [ 10%]
-    color_strip = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+    def advance(pct: int):
+        # Redraw only when the percentage moves; Nuitka prints thousands of
+        # progress lines and a console write per line slows the pipe reader.
+        if pct != pbar.n:
+            pbar.n = pct
+            pbar.refresh()
 
-    for line in iter(process.stdout.readline, ''):
-        if not line:
-            break
-        line = line.rstrip()
-        # Strip ANSI colors if present
-        clean_line = color_strip.sub('', line)
+    # Match on raw bytes and only decode the lines that get reported;
+    # nearly all of Nuitka's output is progress noise.
+    for raw in process.stdout:
+        line = raw.rstrip()
+        # Strip ANSI colors if present (NO_COLOR is set, so usually there are none)
+        clean_line = ANSI_RE.sub(b'', line) if b'\x1b' in line else line
         
         # Track phases and update pbar
-        if "Completed Python level" in clean_line:
+        if b"Completed Python level" in clean_line:
             pbar.set_description("Phase 2/3: Generating C code")
             pbar.n = 33 # roughly 1/3
             pbar.refresh()
-        elif "Running C compilation" in clean_line:
+        elif b"Running C compilation" in clean_line:
             pbar.set_description("Phase 3/3: Compiling C code")
             pbar.n = 66 # roughly 2/3
             pbar.refresh()
-        elif "Backend C:" in clean_line:
-            # Try to find percentage like [ 10%]
-            if "%" in clean_line:
-                try:
-                    pct_str = clean_line.split("[")[1].split("%")[0].strip()
-                    pct = int(pct_str)
-                    # Maps 0-100% C comp to 66-100% total progress
-                    total_pct = 66 + int(pct * 0.34)
-                    pbar.n = total_pct
-                    pbar.set_postfix_str(f"C Comp: {pct}%")
-                    pbar.refresh()
-                except:
-                    pass
-        elif "Optimizing module" in clean_line:
-            match = module_regex.search(clean_line)
+        elif b"Backend C:" in clean_line:
+            if match := C_PROGRESS_RE.search(clean_line):
+                pct = int(match.group(1))
+                if pct != c_pct:
+                    c_pct = pct
+                    pbar.set_postfix_str(f"C Comp: {pct}%", refresh=False)
+                # Maps 0-100% C comp to 66-100% total progress
+                advance(66 + int(pct * 0.34))
+        elif b"Optimizing module" in clean_line:
+            match = MODULE_PROGRESS_RE.search(clean_line)
             if match:
                 done = int(match.group(1))
                 total = int(match.group(2))
                 modules_done = done
                 modules_total = total
+                pbar.set_description(f"Phase 1/3: Optimizing ({done}/{total})", refresh=False)
                 # Maps module progress to 0-33% total progress
-                total_pct = int((done / total) * 33)
-                pbar.n = total_pct
-                pbar.set_description(f"Phase 1/3: Optimizing ({done}/{total})")
-                pbar.refresh()
+                advance(int((done / total) * 33))
             
-        elif "error:" in clean_line.lower() and "torch" not in clean_line.lower():
-            errors.append(clean_line)
-        elif "warning:" in clean_line.lower() and any(kw in clean_line.lower() for kw in ["missing", "failed"]):
-            tqdm.write(f"[{elapsed()}] ⚠️  {clean_line}")
+        else:
+            lowered = clean_line.lower()
+            if b"error:" in lowered and b"torch" not in lowered:
+                errors.append(clean_line.decode("utf-8", "replace"))
+            elif b"warning:" in lowered and (b"missing" in lowered or b"failed" in lowered):
+                tqdm.write(f"[{elapsed()}] ⚠️  {clean_line.decode('utf-8', 'replace')}")
     
     pbar.n = 100
     pbar.set_description("Compilation Finished")
@@ -489,9 +642,10 @@ def compile_nuitka():
     target = PROD_DIR / "dist"
     
     if dist.exists():
+        discard_tree(target)
         if target.exists():
-            shutil.rmtree(target)
-        shutil.move(str(dist), str(target))
+            raise RuntimeError(f"Could not remove old {target.name} (is CamMana running?)")
+        os.replace(dist, target)
         
         src = target / "app.exe"
         dst = target / "CamMana.exe"
@@ -500,6 +654,7 @@ def compile_nuitka():
                 dst.unlink()
             src.rename(dst)
         
+        write_stamp("nuitka", digest)
         size_mb = dst.stat().st_size / 1024 / 1024
         log(f"Executable created: CamMana.exe ({size_mb:.1f} MB)", "success")
     else:
@@ -529,7 +684,7 @@ def package_inno():
     if result.returncode == 0:
         src = OUTPUT_DIR / "CamMana_Setup.exe"
         if src.exists():
-            shutil.copy2(src, ROOT_DIR / "CamMana_Setup.exe")
+            link_or_copy(src, ROOT_DIR / "CamMana_Setup.exe")
             size_mb = src.stat().st_size / 1024 / 1024
             log(f"Installer created: CamMana_Setup.exe ({size_mb:.1f} MB)", "success")
     else:
@@ -553,7 +708,8 @@ def main():
     print(f"  Started at: {datetime.now().strftime('%H:%M:%S')}")
     print(f"  CPU cores:  {CPU_CORES} (using {NUITKA_JOBS} workers)")
     print("  💡 Tip: Disable Antivirus for the build folder to speed up Phase 3.")
-    print("  💡 Tip: Install 'ccache' to make incremental builds instant.")
+    if not shutil.which("ccache"):
+        print("  💡 Tip: Install 'ccache' to make incremental builds instant.")
     print()
     
     try:
@@ -567,9 +723,13 @@ def main():
             # Sync version/author to installer config
             sync_installer_config()
             
-            clean(incremental=INCREMENTAL)
-            if not BACKEND_ONLY:
-                build_frontend()
+            # The frontend build only touches frontend/, so it runs while the
+            # build dirs are being cleaned; Nuitka needs its output, so join first.
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                frontend = None if BACKEND_ONLY else pool.submit(build_frontend)
+                clean(incremental=INCREMENTAL)
+                if frontend:
+                    frontend.result()
             compile_nuitka()
             package_inno()
         